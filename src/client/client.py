@@ -4,35 +4,133 @@ Versão melhorada com autocomplete, feedback visual rico e configuração persis
 """
 
 import socket
+import selectors
 import threading
 import sys
-import os
-from datetime import datetime
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import time
 
 from common.protocol import Message, MessageType
-from common.config import DEFAULT_HOST, DEFAULT_PORT, BUFFER_SIZE, ENCODING, DEFAULT_CATEGORIES
+from common.config import (
+    DEFAULT_HOST, DEFAULT_PORT, BUFFER_SIZE, SOCKET_BUFFER_SIZE, ENCODING,
+    DEFAULT_CATEGORIES, DEFAULT_CATEGORIES_SET
+)
 from common.ui_helpers import (
     normalize_command, normalize_category, suggest_category,
     display_news_rich, display_history_rich, display_categories_rich,
-    show_contextual_help,
+    show_contextual_help, CATEGORY_EMOJIS,
     RICH_AVAILABLE, console
 )
 
+if RICH_AVAILABLE:
+    from rich.panel import Panel
+else:
+    Panel = None
+
 # Tenta importar prompt_toolkit para autocomplete
 try:
     from prompt_toolkit import PromptSession
     from prompt_toolkit.completion import WordCompleter
     from prompt_toolkit.history import FileHistory
+    from prompt_toolkit.patch_stdout import patch_stdout
     PROMPT_TOOLKIT_AVAILABLE = True
 except ImportError:
     PROMPT_TOOLKIT_AVAILABLE = False
 
+# Sem prompt_toolkit, readline dá ao input() edição de linha e histórico
+try:
+    import readline
+except ImportError:
+    pass
+
+
+# Tipos de mensagem recebidos, internados para comparação rápida
+_NEWS = sys.intern(MessageType.NEWS_UPDATE)
+_OK = sys.intern(MessageType.SUCCESS)
+_ERR = sys.intern(MessageType.ERROR)
+_LST = sys.intern(MessageType.CATEGORIES_LIST)
+_HIST = sys.intern(MessageType.NEWS_HISTORY)
+
+# Palavras do autocomplete, montadas uma única vez
+_COMPLETER_WORDS = (
+    'INSCREVER', 'REMOVER', 'LISTAR', 'HISTORICO', 'SAIR', 'HELP',
+    'sub', 'unsub', 'ls', 'hist', 'exit', '+', '-',
+    *DEFAULT_CATEGORIES
+)
+
+if PROMPT_TOOLKIT_AVAILABLE:
+    _COMPLETER = WordCompleter(list(_COMPLETER_WORDS), ignore_case=True, sentence=True)
+else:
+    _COMPLETER = None
+
+# Menu de categorias dos comandos INSCREVER/REMOVER sem argumentos
+_CATEGORY_MENU = (
+    ('1', 'tecnologia', '💻 Tecnologia'),
+    ('2', 'esportes', '⚽ Esportes'),
+    ('3', 'cultura', '🎭 Cultura'),
+    ('4', 'politica', '🏛️  Política'),
+    ('5', 'economia', '💰 Economia'),
+    ('6', 'entretenimento', '🎬 Entretenimento')
+)
+
+# Linhas do menu já formatadas; só o indicador {status} varia
+_CATEGORY_MENU_LINES = tuple(
+    (num, cat, f"  {num}. {{status}} {label}") for num, cat, label in _CATEGORY_MENU
+)
+
+_STATUS_SUBSCRIBED = "[green]✓[/green]" if RICH_AVAILABLE else "✓"
+_STATUS_AVAILABLE = "[dim]○[/dim]" if RICH_AVAILABLE else "○"
+
+# Opções do wizard: "todas" é a opção 0 e as demais seguem em ordem alfabética
+_WIZARD_CATEGORIES = tuple(
+    (str(idx), cat)
+    for idx, cat in enumerate(sorted(cat for cat in DEFAULT_CATEGORIES if cat != 'todas'), 1)
+)
+_WIZARD_MENU_LINES = (
+    ([f"  0. {CATEGORY_EMOJIS.get('todas', '📰')} Todas"] if 'todas' in DEFAULT_CATEGORIES_SET else []) +
+    [f"  {num}. {CATEGORY_EMOJIS.get(cat, '📌')} {cat.capitalize()}" for num, cat in _WIZARD_CATEGORIES]
+)
+
+
+def _split_categories(text: str) -> list:
+    """
+    Separa uma lista de categorias digitada pelo usuário.
+
+    Converte para minúsculas e remove espaços de uma só vez, em vez de
+    aplicar strip()/lower() item a item.
+
+    Args:
+        text: Categorias separadas por vírgula (ex: "Tecnologia, esportes")
+
+    Returns:
+        Lista de categorias não vazias
+    """
+    return [cat for cat in text.lower().replace(' ', '').split(',') if cat]
+
+
+def _write_lines(lines: list):
+    """
+    Exibe várias linhas com uma única escrita no terminal.
+
+    Args:
+        lines: Linhas a exibir (com marcação Rich quando disponível)
+    """
+    text = "\n".join(lines)
+    if RICH_AVAILABLE:
+        console.print(text)
+    else:
+        sys.stdout.write(text + "\n")
+        sys.stdout.flush()
+
 
 class NewsClient:
     """Cliente de notícias com suporte a assinaturas e interface melhorada"""
 
+    # Limite de mensagens acumuladas antes de forçar o envio
+    _MAX_PENDING = 8
+
+    # Quantidade de mensagens já decodificadas mantidas em cache
+    _PARSE_CACHE_SIZE = 512
+
     def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
         self.host = host
         self.port = port
@@ -49,20 +147,46 @@ class NewsClient:
         # Tracking
         self.subscriptions = set()
         self.news_received_count = 0
-        self.session_start = datetime.now()
+        self.session_start = time.monotonic()
+
+        # Buffer de recepção reutilizado entre chamadas de recv
+        self._recv_buf = bytearray(BUFFER_SIZE)
+        self._recv_mv = memoryview(self._recv_buf)
+
+        # Mensagens codificadas aguardando envio
+        self._pending = []
+
+        # Reimpressão do prompt adiada até o fim de uma rajada de notícias
+        self._prompt_dirty = threading.Event()
+        self._prompt_timer = None
+
+        # Cache de mensagens recebidas já decodificadas (usado só pela
+        # thread de recepção; os dicionários não são alterados)
+        self._parse_cache = {}
+
+        # Tipo de mensagem recebida -> método que a trata
+        self._msg_handlers = {
+            _NEWS: self._on_news,
+            _OK: self._on_success,
+            _ERR: self._on_error,
+            _LST: self._on_categories,
+            _HIST: self._on_history,
+        }
+
+        # Comando normalizado -> método que o executa
+        self._command_handlers = {
+            "INSCREVER": self._cmd_subscribe,
+            "REMOVER": self._cmd_unsubscribe,
+            "LISTAR": self._cmd_list,
+            "HISTORICO": self._cmd_history,
+            "HELP": self._cmd_help,
+            "SAIR": self._cmd_quit,
+        }
 
         # Prompt session com autocomplete (sem histórico persistente)
         if PROMPT_TOOLKIT_AVAILABLE:
-            completer = WordCompleter(
-                ['INSCREVER', 'REMOVER', 'LISTAR', 'HISTORICO', 'SAIR', 'HELP',
-                 'sub', 'unsub', 'ls', 'hist', 'exit', '+', '-'] +
-                list(DEFAULT_CATEGORIES),
-                ignore_case=True,
-                sentence=True
-            )
-
             self.prompt_session = PromptSession(
-                completer=completer,
+                completer=_COMPLETER,
                 complete_while_typing=False
             )
         else:
@@ -77,7 +201,21 @@ class NewsClient:
         """
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Buffers do kernel maiores absorvem rajadas de notícias; são
+            # definidos antes do connect para valerem na negociação da janela
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
             self.socket.connect((self.host, self.port))
+            # Comandos são mensagens pequenas: desativa o algoritmo de Nagle
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # ACKs imediatos (apenas Linux)
+            if hasattr(socket, "TCP_QUICKACK"):
+                try:
+                    self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+                except OSError:
+                    pass
+            # Recepção acorda periodicamente para verificar self.running
+            self.socket.settimeout(1.0)
             self.connected = True
             self.running = True
 
@@ -112,13 +250,18 @@ class NewsClient:
         """Desconecta do servidor"""
         if self.connected:
             try:
-                self._send_message(Message.create(MessageType.DISCONNECT))
+                # Limita a espera caso o servidor tenha parado de ler
+                self.socket.settimeout(0.1)
+                self._send_bytes(Message.DISCONNECT_BYTES, flush_now=True)
             except:
                 pass
 
         self.running = False
         self.connected = False
 
+        if self._prompt_timer is not None:
+            self._prompt_timer.cancel()
+
         if self.socket:
             try:
                 self.socket.close()
@@ -126,9 +269,7 @@ class NewsClient:
                 pass
 
         # Mostra estatísticas da sessão
-        session_duration = (datetime.now() - self.session_start).total_seconds()
-        minutes = int(session_duration // 60)
-        seconds = int(session_duration % 60)
+        minutes, seconds = divmod(int(time.monotonic() - self.session_start), 60)
 
         if RICH_AVAILABLE:
             console.print(f"\n[yellow]📊 Estatísticas da sessão:[/yellow]")
@@ -143,41 +284,73 @@ class NewsClient:
 
     def _receive_messages(self):
         """Thread que recebe mensagens do servidor continuamente"""
-        buffer = ""
+        # Buffer em bytes: só decodifica mensagens completas
+        buffer = bytearray()
+
+        # Referências locais usadas a cada recv/mensagem
+        recv_into = self.socket.recv_into
+        recv_mv = self._recv_mv
+        handle = self._handle_message
+        flush = sys.stdout.flush
+
+        # Espera por dados com o seletor do sistema (epoll no Linux); o
+        # timeout permite verificar self.running periodicamente
+        selector = selectors.DefaultSelector()
+        selector.register(self.socket, selectors.EVENT_READ)
+        select = selector.select
 
         try:
             while self.running and self.connected:
-                data = self.socket.recv(BUFFER_SIZE).decode(ENCODING)
+                if not select(timeout=1.0):
+                    continue
+
+                try:
+                    n = recv_into(recv_mv)
+                except socket.timeout:
+                    continue
 
-                if not data:
+                if not n:
                     if RICH_AVAILABLE:
                         console.print("\n[yellow]Servidor desconectou[/yellow]")
                     else:
-                        print("\nServidor desconectou")
+                        print("\nServidor desconectou", flush=True)
                     self.connected = False
                     break
 
-                buffer += data
-                messages = buffer.split('\n')
-                buffer = messages[-1]
+                buffer += recv_mv[:n]
 
-                for raw_msg in messages[:-1]:
-                    if raw_msg.strip():
-                        self._handle_message(raw_msg)
+                # Percorre o bloco por offset e descarta o consumido de uma vez
+                start = 0
+                idx = buffer.find(b'\n')
+                while idx >= 0:
+                    frame = bytes(buffer[start:idx])
+                    start = idx + 1
+                    # Linhas vazias são descartadas sem decodificar; bytes
+                    # inválidos não derrubam a thread de recepção
+                    if frame.strip():
+                        handle(frame.decode(ENCODING, errors='replace'))
+                    idx = buffer.find(b'\n', start)
+                del buffer[:start]
+
+                # Uma única escrita no terminal por bloco recebido
+                flush()
 
         except ConnectionResetError:
             if RICH_AVAILABLE:
                 console.print("\n[red]Conexão perdida com o servidor[/red]")
             else:
-                print("\nConexão perdida com o servidor")
+                print("\nConexão perdida com o servidor", flush=True)
             self.connected = False
-        except Exception as e:
+        except (OSError, ValueError) as e:
+            # Erros durante o encerramento (socket fechado) são esperados
             if self.running:
                 if RICH_AVAILABLE:
                     console.print(f"\n[red]Erro ao receber mensagem:[/red] {e}")
                 else:
-                    print(f"\nErro ao receber mensagem: {e}")
+                    print(f"\nErro ao receber mensagem: {e}", flush=True)
                 self.connected = False
+        finally:
+            selector.close()
 
     def _handle_message(self, raw_message: str):
         """
@@ -186,60 +359,111 @@ class NewsClient:
         Args:
             raw_message: Mensagem bruta recebida
         """
-        msg = Message.parse(raw_message)
-        msg_type = msg.get("type")
-        data = msg.get("data", {})
+        cache = self._parse_cache
+        msg = cache.get(raw_message)
+        if msg is None:
+            msg = Message.parse(raw_message)
+            if len(cache) >= self._PARSE_CACHE_SIZE:
+                # Descarta a entrada mais antiga (ordem de inserção)
+                del cache[next(iter(cache))]
+            cache[raw_message] = msg
+
+        # Tabela indexada pelo tipo: uma consulta em vez da cadeia de if/elif
+        handler = self._msg_handlers.get(msg.get("type"))
+        if handler is not None:
+            handler(msg.get("data", {}))
+
+    def _on_news(self, data: dict):
+        """Exibe uma nova notícia recebida"""
+        title = data.get("title", "")
+        lead = data.get("lead", "")
+        category = data.get("category", "")
+
+        # Exibe com formatação rica
+        display_news_rich(title, lead, category)
+
+        # Atualiza contadores
+        self.news_received_count += 1
+
+        # Reimprime prompt (com prompt_toolkit o próprio prompt se redesenha)
+        if not self.prompt_session and not self._prompt_dirty.is_set():
+            self._prompt_dirty.set()
+            self._prompt_timer = threading.Timer(0.05, self._flush_prompt)
+            self._prompt_timer.daemon = True
+            self._prompt_timer.start()
+
+    def _flush_prompt(self):
+        """Reimprime o prompt uma única vez após uma rajada de notícias"""
+        self._prompt_dirty.clear()
+        if RICH_AVAILABLE:
+            console.print("> ", end="")
+        else:
+            sys.stdout.write("> ")
+            sys.stdout.flush()
 
-        if msg_type == MessageType.NEWS_UPDATE:
-            # Nova notícia recebida
-            title = data.get("title", "")
-            lead = data.get("lead", "")
-            category = data.get("category", "")
+    def _on_success(self, data: dict):
+        """Exibe confirmação do servidor"""
+        message = data.get("message", "")
+        if RICH_AVAILABLE:
+            console.print(f"[green]✓[/green] {message}")
+        else:
+            print(f"✓ {message}")
 
-            # Exibe com formatação rica
-            display_news_rich(title, lead, category)
+    def _on_error(self, data: dict):
+        """Exibe erro informado pelo servidor"""
+        message = data.get("message", "")
+        if RICH_AVAILABLE:
+            console.print(f"[red]✗[/red] {message}")
+        else:
+            print(f"✗ {message}")
 
-            # Atualiza contadores
-            self.news_received_count += 1
+    def _on_categories(self, data: dict):
+        """Exibe a lista de categorias disponíveis"""
+        categories = data.get("categories", [])
+        display_categories_rich(categories, self.subscriptions)
 
-            # Reimprime prompt
-            if RICH_AVAILABLE:
-                console.print("> ", end="")
-            else:
-                print("> ", end="", flush=True)
+    def _on_history(self, data: dict):
+        """Exibe o histórico de notícias"""
+        news_list = data.get("news", [])
+        display_history_rich(news_list, mode='full')
 
-        elif msg_type == MessageType.SUCCESS:
-            message = data.get("message", "")
-            if RICH_AVAILABLE:
-                console.print(f"[green]✓[/green] {message}")
-            else:
-                print(f"✓ {message}")
-
-        elif msg_type == MessageType.ERROR:
-            message = data.get("message", "")
-            if RICH_AVAILABLE:
-                console.print(f"[red]✗[/red] {message}")
-            else:
-                print(f"✗ {message}")
+    def _send_message(self, message: str, flush_now: bool = False):
+        """
+        Enfileira uma mensagem para o servidor.
 
-        elif msg_type == MessageType.CATEGORIES_LIST:
-            categories = data.get("categories", [])
-            display_categories_rich(categories, self.subscriptions)
+        As mensagens são acumuladas e enviadas juntas por _flush, que é
+        chamado ao fim de cada comando.
 
-        elif msg_type == MessageType.NEWS_HISTORY:
-            news_list = data.get("news", [])
-            display_history_rich(news_list, mode='full')
+        Args:
+            message: Mensagem a enviar
+            flush_now: Se True, envia imediatamente as mensagens pendentes
+        """
+        self._send_bytes(message.encode(ENCODING), flush_now)
 
-    def _send_message(self, message: str):
+    def _send_bytes(self, data: bytes, flush_now: bool = False):
         """
-        Envia uma mensagem para o servidor.
+        Enfileira uma mensagem já codificada para o servidor.
 
         Args:
-            message: Mensagem a enviar
+            data: Mensagem em bytes (com terminador)
+            flush_now: Se True, envia imediatamente as mensagens pendentes
         """
+        if self.connected and self.socket:
+            self._pending.append(data)
+            if flush_now or len(self._pending) >= self._MAX_PENDING:
+                self._flush()
+
+    def _flush(self):
+        """Envia de uma só vez as mensagens pendentes"""
+        if not self._pending:
+            return
+
+        data = b"".join(self._pending)
+        self._pending.clear()
+
         if self.connected and self.socket:
             try:
-                self.socket.sendall(message.encode(ENCODING))
+                self.socket.sendall(data)
             except Exception as e:
                 if RICH_AVAILABLE:
                     console.print(f"[red]Erro ao enviar mensagem:[/red] {e}")
@@ -257,9 +481,23 @@ class NewsClient:
         self._send_message(Message.unsubscribe(category))
         self.subscriptions.discard(category)
 
+    def subscribe_many(self, categories: list):
+        """Inscreve em várias categorias com uma única mensagem"""
+        if not categories:
+            return
+        self._send_message(Message.subscribe_many(categories))
+        self.subscriptions.update(categories)
+
+    def unsubscribe_many(self, categories: list):
+        """Remove várias inscrições com uma única mensagem"""
+        if not categories:
+            return
+        self._send_message(Message.unsubscribe_many(categories))
+        self.subscriptions.difference_update(categories)
+
     def list_categories(self):
         """Lista categorias disponíveis"""
-        self._send_message(Message.create(MessageType.LIST_CATEGORIES))
+        self._send_bytes(Message.LIST_CATEGORIES_BYTES)
 
     def request_history(self, category: str = None, limit: int = 10):
         """Solicita histórico de notícias"""
@@ -275,7 +513,8 @@ class NewsClient:
         Returns:
             Tupla (categoria, limite)
         """
-        if not args.strip():
+        args = args.strip()
+        if not args:
             return (None, 10)
 
         # Tenta parsear diferentes formatos
@@ -288,63 +527,53 @@ class NewsClient:
         category = None
         limit = 10
 
-        # Formato simples
-        parts = args.strip().split()
+        # Formato simples: só os dois primeiros termos importam
+        parts = args.split(None, 2)
+        first = parts[0]
+        # isascii() evita dígitos Unicode (ex: "²") que int() não aceita
+        first_is_num = first.isascii() and first.isdigit()
 
         if len(parts) == 1:
             # Pode ser categoria ou número
-            if parts[0].isdigit():
-                limit = int(parts[0])
+            if first_is_num:
+                limit = int(first)
             else:
-                category = normalize_category(parts[0])
-        elif len(parts) >= 2:
+                category = normalize_category(first)
+        else:
             # Primeiro argumento é categoria, segundo é limite
-            if parts[1].isdigit():
-                category = normalize_category(parts[0])
-                limit = int(parts[1])
-            elif parts[0].isdigit():
-                limit = int(parts[0])
+            second = parts[1]
+            if second.isascii() and second.isdigit():
+                category = normalize_category(first)
+                limit = int(second)
+            elif first_is_num:
+                limit = int(first)
             else:
-                category = normalize_category(parts[0])
+                category = normalize_category(first)
 
         return (category, limit)
 
     def _interactive_subscribe(self):
         """Menu interativo para inscrição em categorias"""
-        categories_list = [
-            ('1', 'tecnologia', '💻 Tecnologia'),
-            ('2', 'esportes', '⚽ Esportes'),
-            ('3', 'cultura', '🎭 Cultura'),
-            ('4', 'politica', '🏛️  Política'),
-            ('5', 'economia', '💰 Economia'),
-            ('6', 'entretenimento', '🎬 Entretenimento')
-        ]
-
+        # Monta o menu inteiro e exibe com uma única escrita
         if RICH_AVAILABLE:
-            console.print("\n[bold cyan]📂 Categorias Disponíveis:[/bold cyan]\n")
+            lines = ["\n[bold cyan]📂 Categorias Disponíveis:[/bold cyan]\n"]
         else:
-            print("\n📂 Categorias Disponíveis:\n")
+            lines = ["\n📂 Categorias Disponíveis:\n"]
 
-        for num, cat, label in categories_list:
-            if cat in self.subscriptions:
-                status = "[green]✓[/green]" if RICH_AVAILABLE else "✓"
-            else:
-                status = "[dim]○[/dim]" if RICH_AVAILABLE else "○"
-
-            if RICH_AVAILABLE:
-                console.print(f"  {num}. {status} {label}")
-            else:
-                print(f"  {num}. {status} {label}")
+        for num, cat, line in _CATEGORY_MENU_LINES:
+            status = _STATUS_SUBSCRIBED if cat in self.subscriptions else _STATUS_AVAILABLE
+            lines.append(line.format(status=status))
 
         # Opção "Todas"
         if RICH_AVAILABLE:
-            console.print(f"  7. [bold]📰 Todas[/bold]")
+            lines.append("  7. [bold]📰 Todas[/bold]")
         else:
-            print(f"  7. 📰 Todas")
+            lines.append("  7. 📰 Todas")
 
-        print("\nDigite os números separados por vírgula (ex: 1,2,6)")
-        print("Ou digite 7 para inscrever em todas")
-        print("Ou deixe em branco para cancelar:")
+        lines.append("\nDigite os números separados por vírgula (ex: 1,2,6)")
+        lines.append("Ou digite 7 para inscrever em todas")
+        lines.append("Ou deixe em branco para cancelar:")
+        _write_lines(lines)
 
         choices = input("> ").strip()
 
@@ -362,19 +591,18 @@ class NewsClient:
             # Verifica se selecionou "Todas"
             if '7' in selected_nums:
                 # Inscreve em todas as categorias que ainda não está inscrito
-                for num, cat, _ in categories_list:
+                for num, cat, _ in _CATEGORY_MENU:
                     if cat not in self.subscriptions:
                         selected_categories.append(cat)
             else:
                 # Processa seleção individual
-                for num, cat, _ in categories_list:
+                for num, cat, _ in _CATEGORY_MENU:
                     if num in selected_nums:
                         if cat not in self.subscriptions:
                             selected_categories.append(cat)
 
             if selected_categories:
-                for cat in selected_categories:
-                    self.subscribe(cat)
+                self.subscribe_many(selected_categories)
             else:
                 if RICH_AVAILABLE:
                     console.print("[yellow]Nenhuma categoria nova selecionada.[/yellow]")
@@ -395,32 +623,21 @@ class NewsClient:
                 print("Você não está inscrito em nenhuma categoria.")
             return
 
-        categories_list = [
-            ('1', 'tecnologia', '💻 Tecnologia'),
-            ('2', 'esportes', '⚽ Esportes'),
-            ('3', 'cultura', '🎭 Cultura'),
-            ('4', 'politica', '🏛️  Política'),
-            ('5', 'economia', '💰 Economia'),
-            ('6', 'entretenimento', '🎬 Entretenimento')
-        ]
-
         if RICH_AVAILABLE:
-            console.print("\n[bold cyan]📂 Suas Assinaturas:[/bold cyan]\n")
+            lines = ["\n[bold cyan]📂 Suas Assinaturas:[/bold cyan]\n"]
         else:
-            print("\n📂 Suas Assinaturas:\n")
+            lines = ["\n📂 Suas Assinaturas:\n"]
 
         # Mostra apenas as categorias inscritas
         available_nums = []
-        for num, cat, label in categories_list:
+        for num, cat, line in _CATEGORY_MENU_LINES:
             if cat in self.subscriptions:
-                if RICH_AVAILABLE:
-                    console.print(f"  {num}. [green]✓[/green] {label}")
-                else:
-                    print(f"  {num}. ✓ {label}")
+                lines.append(line.format(status=_STATUS_SUBSCRIBED))
                 available_nums.append(num)
 
-        print("\nDigite os números das categorias que deseja remover (ex: 1,2)")
-        print("Ou deixe em branco para cancelar:")
+        lines.append("\nDigite os números das categorias que deseja remover (ex: 1,2)")
+        lines.append("Ou deixe em branco para cancelar:")
+        _write_lines(lines)
 
         choices = input("> ").strip()
 
@@ -435,7 +652,7 @@ class NewsClient:
             selected_nums = [c.strip() for c in choices.split(',')]
             categories_to_remove = []
 
-            for num, cat, _ in categories_list:
+            for num, cat, _ in _CATEGORY_MENU:
                 if num in selected_nums and cat in self.subscriptions:
                     categories_to_remove.append(cat)
 
@@ -456,8 +673,7 @@ class NewsClient:
                             print("Operação cancelada.")
                         return
 
-                for cat in categories_to_remove:
-                    self.unsubscribe(cat)
+                self.unsubscribe_many(categories_to_remove)
             else:
                 if RICH_AVAILABLE:
                     console.print("[yellow]Nenhuma categoria válida selecionada.[/yellow]")
@@ -472,7 +688,6 @@ class NewsClient:
     def _setup_wizard(self):
         """Wizard de configuração no início da sessão"""
         if RICH_AVAILABLE:
-            from rich.panel import Panel
             console.print(Panel(
                 "[bold cyan]🎉 BEM-VINDO AO FEED DE NOTÍCIAS![/bold cyan]\n\n"
                 "Vamos configurar sua sessão...",
@@ -480,10 +695,12 @@ class NewsClient:
                 border_style="green"
             ))
         else:
-            print("\n" + "="*60)
-            print("        🎉 BEM-VINDO AO FEED DE NOTÍCIAS!")
-            print("="*60)
-            print("\nVamos configurar sua sessão...\n")
+            _write_lines([
+                "\n" + "="*60,
+                "        🎉 BEM-VINDO AO FEED DE NOTÍCIAS!",
+                "="*60,
+                "\nVamos configurar sua sessão...\n",
+            ])
 
         # Nome
         print("\n📝 Como devemos te chamar?")
@@ -492,34 +709,14 @@ class NewsClient:
             self.session_config['user_name'] = name
 
         # Categorias Iniciais
-        print("\n📂 Quais categorias te interessam?")
-        print("\nCategorias disponíveis:")
-
-        # Gera lista dinâmica de categorias
-        from common.ui_helpers import CATEGORY_EMOJIS
-
-        # Separa "todas" das outras categorias
-        other_cats = [cat for cat in DEFAULT_CATEGORIES if cat != 'todas']
-        sorted_cats = sorted(other_cats)
-
-        # Monta lista começando com "todas" (0) e depois as outras (1+)
-        categories_list = []
-
-        # Adiciona "todas" como opção 0
-        if 'todas' in DEFAULT_CATEGORIES:
-            emoji = CATEGORY_EMOJIS.get('todas', '📰')
-            print(f"  0. {emoji} Todas")
-
-        # Adiciona outras categorias numeradas
-        for idx, cat in enumerate(sorted_cats, 1):
-            emoji = CATEGORY_EMOJIS.get(cat, '📌')
-            cat_display = cat.capitalize()
-            print(f"  {idx}. {emoji} {cat_display}")
-            categories_list.append((str(idx), cat))
-
-        print("\nDigite os números separados por vírgula (ex: 1,2,6)")
-        print("Ou digite 0 para inscrever em todas")
-        print("Ou deixe em branco para escolher depois:")
+        _write_lines([
+            "\n📂 Quais categorias te interessam?",
+            "\nCategorias disponíveis:",
+            *_WIZARD_MENU_LINES,
+            "\nDigite os números separados por vírgula (ex: 1,2,6)",
+            "Ou digite 0 para inscrever em todas",
+            "Ou deixe em branco para escolher depois:",
+        ])
 
         choices = input("> ").strip()
 
@@ -531,11 +728,11 @@ class NewsClient:
                 # Verifica se selecionou "Todas"
                 if '0' in selected_nums:
                     # Adiciona categoria "todas"
-                    if 'todas' in DEFAULT_CATEGORIES:
+                    if 'todas' in DEFAULT_CATEGORIES_SET:
                         selected_categories.append('todas')
                 else:
                     # Processa seleção individual
-                    for num, cat in categories_list:
+                    for num, cat in _WIZARD_CATEGORIES:
                         if num in selected_nums:
                             selected_categories.append(cat)
 
@@ -556,10 +753,12 @@ class NewsClient:
                 border_style="green"
             ))
         else:
-            print("\n" + "="*60)
-            print("✅ Configuração concluída!")
-            print("="*60)
-            print("\nConectando ao servidor...\n")
+            _write_lines([
+                "\n" + "="*60,
+                "✅ Configuração concluída!",
+                "="*60,
+                "\nConectando ao servidor...\n",
+            ])
 
     def run_interactive(self):
         """Executa o cliente em modo interativo"""
@@ -585,8 +784,8 @@ class NewsClient:
             else:
                 print("Inscrevendo em categorias selecionadas...")
 
-            for cat in self.session_config['initial_categories']:
-                self.subscribe(cat)
+            self.subscribe_many(self.session_config['initial_categories'])
+            self._flush()
 
         # Mostra ajuda inicial se não tiver assinaturas
         if not self.subscriptions:
@@ -594,6 +793,15 @@ class NewsClient:
 
         print()  # Linha em branco
 
+        if self.prompt_session:
+            # Saídas da thread de recepção são impressas acima do prompt
+            with patch_stdout():
+                self._command_loop()
+        else:
+            self._command_loop()
+
+    def _command_loop(self):
+        """Laço de leitura e execução de comandos do usuário"""
         try:
             while self.connected:
                 try:
@@ -610,6 +818,7 @@ class NewsClient:
 
                     # Processa comando
                     self._process_command(command)
+                    self._flush()
 
                 except EOFError:
                     break
@@ -631,120 +840,168 @@ class NewsClient:
             command: Comando digitado
         """
         parts = command.split(maxsplit=1)
-        cmd = normalize_command(parts[0])
+        handler = self._command_handlers.get(normalize_command(parts[0]))
 
-        if cmd == "INSCREVER":
-            if len(parts) < 2:
-                # Menu interativo de inscrição
-                self._interactive_subscribe()
+        if handler is not None:
+            handler(parts)
+        else:
+            if RICH_AVAILABLE:
+                console.print(f"[red]✗[/red] Comando desconhecido: [bold]{parts[0]}[/bold]")
+                console.print("[yellow]💡 Digite HELP para ver comandos disponíveis[/yellow]")
             else:
-                # Separa múltiplas categorias por vírgula
-                categories = [cat.strip() for cat in parts[1].split(',')]
+                print(f"✗ Comando desconhecido: {parts[0]}")
+                print("💡 Digite HELP para ver comandos disponíveis")
 
-                for category in categories:
-                    if not category:
-                        continue
+    def _cmd_subscribe(self, parts: list):
+        """Comando INSCREVER"""
+        if len(parts) < 2:
+            # Menu interativo de inscrição
+            self._interactive_subscribe()
+        else:
+            # Separa múltiplas categorias por vírgula
+            categories = _split_categories(parts[1])
+            to_subscribe = []
+
+            for category in categories:
+                # Normaliza categoria
+                normalized = normalize_category(category)
 
-                    # Normaliza categoria
-                    normalized = normalize_category(category)
-
-                    # Verifica se categoria existe
-                    if normalized not in DEFAULT_CATEGORIES:
-                        # Tenta sugerir
-                        suggestion = suggest_category(normalized, DEFAULT_CATEGORIES)
-
-                        if suggestion:
-                            if RICH_AVAILABLE:
-                                console.print(f"[yellow]⚠️  Categoria '{category}' não existe.[/yellow]")
-                                console.print(f"[cyan]💡 Você quis dizer '{suggestion}'? (s/N):[/cyan] ", end="")
-                            else:
-                                print(f"⚠️  Categoria '{category}' não existe.")
-                                print(f"💡 Você quis dizer '{suggestion}'? (s/N): ", end="")
-
-                            choice = input().strip().lower()
-                            if choice == 's':
-                                self.subscribe(suggestion)
-                            continue
+                # Verifica se categoria existe
+                if normalized not in DEFAULT_CATEGORIES_SET:
+                    # Tenta sugerir
+                    suggestion = suggest_category(normalized, DEFAULT_CATEGORIES)
+
+                    if suggestion:
+                        if RICH_AVAILABLE:
+                            console.print(f"[yellow]⚠️  Categoria '{category}' não existe.[/yellow]")
+                            console.print(f"[cyan]💡 Você quis dizer '{suggestion}'? (s/N):[/cyan] ", end="")
                         else:
-                            if RICH_AVAILABLE:
-                                console.print(f"[red]✗[/red] Categoria '{category}' não existe.")
-                                console.print("[yellow]💡 Use LISTAR para ver categorias disponíveis[/yellow]")
-                            else:
-                                print(f"✗ Categoria '{category}' não existe.")
-                                print("💡 Use LISTAR para ver categorias disponíveis")
-                            continue
-
-                    self.subscribe(normalized)
-
-        elif cmd == "REMOVER":
-            if len(parts) < 2:
-                # Menu interativo de remoção
-                self._interactive_unsubscribe()
-            else:
-                categories = [cat.strip() for cat in parts[1].split(',')]
+                            print(f"⚠️  Categoria '{category}' não existe.")
+                            print(f"💡 Você quis dizer '{suggestion}'? (s/N): ", end="")
 
-                # Se remover múltiplas, pede confirmação
-                if len(categories) > 3:
-                    if RICH_AVAILABLE:
-                        console.print(f"[yellow]⚠️  Você está prestes a remover {len(categories)} categorias.[/yellow]")
-                        console.print("[cyan]Confirmar? (s/N):[/cyan] ", end="")
+                        choice = input().strip().lower()
+                        if choice == 's':
+                            to_subscribe.append(suggestion)
+                        continue
                     else:
-                        print(f"⚠️  Você está prestes a remover {len(categories)} categorias.")
-                        print("Confirmar? (s/N): ", end="")
-
-                    if input().strip().lower() != 's':
                         if RICH_AVAILABLE:
-                            console.print("[yellow]Operação cancelada.[/yellow]")
+                            console.print(f"[red]✗[/red] Categoria '{category}' não existe.")
+                            console.print("[yellow]💡 Use LISTAR para ver categorias disponíveis[/yellow]")
                         else:
-                            print("Operação cancelada.")
-                        return
+                            print(f"✗ Categoria '{category}' não existe.")
+                            print("💡 Use LISTAR para ver categorias disponíveis")
+                        continue
 
-                for category in categories:
-                    if category:
-                        normalized = normalize_category(category)
-                        self.unsubscribe(normalized)
+                to_subscribe.append(normalized)
 
-        elif cmd == "LISTAR":
-            self.list_categories()
+            # Todas as categorias seguem numa única mensagem
+            self.subscribe_many(to_subscribe)
 
-        elif cmd == "HISTORICO":
-            args = parts[1] if len(parts) > 1 else ""
-            category, limit = self.parse_history_command(args)
-            self.request_history(category, limit)
+    def _cmd_unsubscribe(self, parts: list):
+        """Comando REMOVER"""
+        if len(parts) < 2:
+            # Menu interativo de remoção
+            self._interactive_unsubscribe()
+        else:
+            categories = _split_categories(parts[1])
 
-        elif cmd == "HELP":
-            show_contextual_help(self.subscriptions)
+            # Se remover múltiplas, pede confirmação
+            if len(categories) > 3:
+                if RICH_AVAILABLE:
+                    console.print(f"[yellow]⚠️  Você está prestes a remover {len(categories)} categorias.[/yellow]")
+                    console.print("[cyan]Confirmar? (s/N):[/cyan] ", end="")
+                else:
+                    print(f"⚠️  Você está prestes a remover {len(categories)} categorias.")
+                    print("Confirmar? (s/N): ", end="")
 
-        elif cmd == "SAIR":
-            if RICH_AVAILABLE:
-                console.print("[yellow]Desconectando...[/yellow]")
-            else:
-                print("Desconectando...")
-            self.running = False
-            self.connected = False
+                if input().strip().lower() != 's':
+                    if RICH_AVAILABLE:
+                        console.print("[yellow]Operação cancelada.[/yellow]")
+                    else:
+                        print("Operação cancelada.")
+                    return
+
+            self.unsubscribe_many([normalize_category(cat) for cat in categories])
 
+    def _cmd_list(self, parts: list):
+        """Comando LISTAR"""
+        self.list_categories()
+
+    def _cmd_history(self, parts: list):
+        """Comando HISTORICO"""
+        args = parts[1] if len(parts) > 1 else ""
+        category, limit = self.parse_history_command(args)
+        self.request_history(category, limit)
+
+    def _cmd_help(self, parts: list):
+        """Comando HELP"""
+        show_contextual_help(self.subscriptions)
+
+    def _cmd_quit(self, parts: list):
+        """Comando SAIR"""
+        if RICH_AVAILABLE:
+            console.print("[yellow]Desconectando...[/yellow]")
         else:
-            if RICH_AVAILABLE:
-                console.print(f"[red]✗[/red] Comando desconhecido: [bold]{parts[0]}[/bold]")
-                console.print("[yellow]💡 Digite HELP para ver comandos disponíveis[/yellow]")
-            else:
-                print(f"✗ Comando desconhecido: {parts[0]}")
-                print("💡 Digite HELP para ver comandos disponíveis")
+            print("Desconectando...")
+        self.running = False
+        self.connected = False
+
+
+def _parse_args_fast(argv: list):
+    """
+    Interpreta --host/--port sem carregar o argparse.
+
+    Args:
+        argv: Argumentos da linha de comando (sem o nome do programa)
+
+    Returns:
+        Tupla (host, port), ou None se houver argumento não reconhecido
+    """
+    host, port = DEFAULT_HOST, DEFAULT_PORT
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if '=' in arg:
+            name, value = arg.split('=', 1)
+        elif i + 1 < len(argv):
+            name, value = arg, argv[i + 1]
+            i += 1
+        else:
+            return None
+
+        if name == "--host":
+            host = value
+        elif name == "--port" and value.isdigit():
+            port = int(value)
+        else:
+            return None
+        i += 1
+
+    return host, port
 
 
 def main():
     """Função principal para executar o cliente"""
-    import argparse
+    parsed = _parse_args_fast(sys.argv[1:])
 
-    parser = argparse.ArgumentParser(description="Cliente de Notícias PUB/SUB")
-    parser.add_argument("--host", default=DEFAULT_HOST, help="Host do servidor")
-    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Porta do servidor")
+    if parsed is None:
+        # --help ou argumentos inválidos: argparse gera a mensagem adequada
+        import argparse
 
-    args = parser.parse_args()
+        parser = argparse.ArgumentParser(description="Cliente de Notícias PUB/SUB")
+        parser.add_argument("--host", default=DEFAULT_HOST, help="Host do servidor")
+        parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Porta do servidor")
 
-    client = NewsClient(args.host, args.port)
-    client.run_interactive()
+        args = parser.parse_args()
+        parsed = (args.host, args.port)
 
+    # Sem line buffering: a saída da thread de recepção é enviada ao
+    # terminal de uma vez, com flush explícito após cada bloco recebido
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
+
+    client = NewsClient(*parsed)
+    client.run_interactive()
 
 if __name__ == "__main__":
     main()
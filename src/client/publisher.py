@@ -3,84 +3,223 @@ Publicador/Editor de notícias.
 Versão melhorada com interface visual rica e validação aprimorada.
 """
 
+import importlib.util
+import json
+import re
 import socket
+import select
+import queue
 import threading
 import sys
-import os
+import time
 from datetime import datetime
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from common.protocol import Message, MessageType
-from common.config import DEFAULT_HOST, DEFAULT_PORT, BUFFER_SIZE, ENCODING, DEFAULT_CATEGORIES
+from common.transport import send_buffers
+from common.config import (
+    DEFAULT_HOST, DEFAULT_PORT, BUFFER_SIZE, SOCKET_BUFFER_SIZE, TCP_USER_TIMEOUT_MS,
+    ENCODING, DEFAULT_CATEGORIES, DEFAULT_CATEGORIES_SET
+)
 from common.ui_helpers import (
     normalize_command, normalize_category, suggest_category,
     display_categories_rich, display_history_rich,
     RICH_AVAILABLE, console, CATEGORY_EMOJIS
 )
 
-# Tenta importar prompt_toolkit para autocomplete
-try:
-    from prompt_toolkit import PromptSession
-    from prompt_toolkit.completion import WordCompleter
-    PROMPT_TOOLKIT_AVAILABLE = True
-except ImportError:
-    PROMPT_TOOLKIT_AVAILABLE = False
+# prompt_toolkit (autocomplete) só é importado quando um prompt interativo é
+# usado; o modo automático não paga o custo da importação
+PROMPT_TOOLKIT_AVAILABLE = importlib.util.find_spec("prompt_toolkit") is not None
+
+# Palavras do autocomplete, montadas uma única vez
+_COMPLETER_WORDS = (
+    'PUBLICAR', 'LISTAR', 'HISTORICO', 'REMOVER', 'LIMPAR', 'SAIR', 'HELP',
+    *DEFAULT_CATEGORIES
+)
+
+# Saída escolhida uma única vez conforme a disponibilidade do Rich
+if RICH_AVAILABLE:
+    _say = console.print
+    _OK_FORMAT = "[green]✓[/green] {}"
+    _ERR_FORMAT = "[red]✗[/red] {}"
+else:
+    _say = print
+    _OK_FORMAT = "✓ {}"
+    _ERR_FORMAT = "✗ {}"
+
+# Respostas SUCESSO/ERRO são as mais frequentes e só carregam um texto: o
+# início da mensagem é reconhecido (com ou sem espaços entre os tokens) e
+# apenas o campo "message" é decodificado
+_REPLY_HEAD = re.compile(
+    r'\{\s*"type"\s*:\s*"(%s|%s)"\s*,\s*"data"\s*:\s*\{\s*"message"\s*:\s*'
+    % (MessageType.SUCCESS, MessageType.ERROR)
+)
+_REPLY_TAIL = re.compile(r'\s*\}\s*\}\s*')
+_raw_decode = json.JSONDecoder().raw_decode
+
+
+def _extract_message(raw_message: str, offset: int):
+    """
+    Extrai o campo message de uma resposta SUCESSO/ERRO reconhecida por _REPLY_HEAD.
+
+    Args:
+        raw_message: Mensagem bruta recebida
+        offset: Posição onde começa o texto da mensagem
+
+    Returns:
+        Texto da mensagem, ou None se a resposta tiver outro formato
+    """
+    try:
+        message, end = _raw_decode(raw_message, offset)
+    except ValueError:
+        return None
+
+    if isinstance(message, str) and _REPLY_TAIL.fullmatch(raw_message, end):
+        return message
+    return None
 
 
 class NewsPublisher:
     """Publicador de notícias para o sistema PUB/SUB"""
 
-    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+    # Quantidade de notícias enviadas juntas no modo automático
+    PUBLISH_BATCH_SIZE = 32
+    # Envios pendentes na fila da thread escritora antes de bloquear quem envia
+    SEND_QUEUE_SIZE = 1024
+    # Intervalo em que quem espera a fila cheia confere se a conexão caiu
+    SEND_QUEUE_POLL = 0.5
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 nodelay: bool = True, sndbuf: int = SOCKET_BUFFER_SIZE,
+                 rcvbuf: int = SOCKET_BUFFER_SIZE):
         self.host = host
         self.port = port
+        self.nodelay = nodelay
+        self.sndbuf = sndbuf
+        self.rcvbuf = rcvbuf
+        # Tamanhos efetivos após o connect (o kernel pode limitar ou dobrar)
+        self.applied_sndbuf = None
+        self.applied_rcvbuf = None
         self.socket = None
+        self._receive_thread = None
+        self._out_q = None
+        self._writer_thread = None
         self.running = False
         self.connected = False
         self.news_published = 0
 
+        # Tipo de mensagem -> método que a trata
+        self._msg_handlers = {
+            MessageType.SUCCESS: self._on_success,
+            MessageType.ERROR: self._on_error,
+            MessageType.CATEGORIES_LIST: self._on_categories,
+            MessageType.NEWS_HISTORY: self._on_history,
+        }
+
+        # Comando normalizado -> método que o executa
+        self._command_handlers = {
+            "PUBLICAR": self._cmd_publish,
+            "LISTAR": self._cmd_list,
+            "HISTORICO": self._cmd_history,
+            "REMOVER": self._cmd_remove,
+            "LIMPAR": self._cmd_clear,
+            "HELP": self._cmd_help,
+            "SAIR": self._cmd_quit,
+        }
+
+        # Buffer de recepção reutilizado entre chamadas de recv
+        self._recv_buf = bytearray(BUFFER_SIZE)
+        self._recv_mv = memoryview(self._recv_buf)
+
         # Para operação de remoção interativa
         self.pending_news_list = None
         self.waiting_for_news_list = False
+        # Sinaliza a chegada da lista aguardada por _interactive_remove
+        self._news_list_event = threading.Event()
+
+        # Sessões de prompt, criadas no primeiro uso (ver prompt_session)
+        self._prompt_session = None
+        self._cat_session = None
+
+    @property
+    def prompt_session(self):
+        """
+        Sessão de prompt com autocomplete e histórico, criada no primeiro uso.
 
-        # Prompt session com autocomplete e histórico
-        if PROMPT_TOOLKIT_AVAILABLE:
+        Returns:
+            PromptSession, ou None se prompt_toolkit não estiver disponível
+        """
+        if self._prompt_session is None and PROMPT_TOOLKIT_AVAILABLE:
             from pathlib import Path
+            from prompt_toolkit import PromptSession
+            from prompt_toolkit.completion import WordCompleter
             from prompt_toolkit.history import FileHistory
 
             history_file = Path.home() / '.news_publisher_history'
 
-            completer = WordCompleter(
-                ['PUBLICAR', 'LISTAR', 'HISTORICO', 'REMOVER', 'LIMPAR', 'SAIR', 'HELP'] +
-                list(DEFAULT_CATEGORIES),
-                ignore_case=True,
-                sentence=True
-            )
-
-            self.prompt_session = PromptSession(
-                completer=completer,
+            self._prompt_session = PromptSession(
+                completer=WordCompleter(list(_COMPLETER_WORDS), ignore_case=True, sentence=True),
                 history=FileHistory(str(history_file))
             )
-        else:
-            self.prompt_session = None
+            # Sessão só de categorias (sem histórico), reutilizada a cada PUBLICAR
+            self._cat_session = PromptSession(
+                completer=WordCompleter(list(DEFAULT_CATEGORIES), ignore_case=True)
+            )
+        return self._prompt_session
 
-    def connect(self) -> bool:
+    def connect(self, start_receiver: bool = True) -> bool:
         """
         Conecta ao servidor de notícias.
 
+        O socket é configurado antes do connect: TCP_NODELAY e TCP_QUICKACK
+        (se nodelay) para respostas rápidas a mensagens pequenas, buffers de
+        envio/recepção dimensionados e SO_KEEPALIVE com TCP_USER_TIMEOUT
+        para detectar conexões mortas sem depender de timers da aplicação.
+
+        Args:
+            start_receiver: Se False, não inicia a thread de recepção; as
+                respostas devem ser lidas com _drain_replies
+
         Returns:
             True se conectou com sucesso, False caso contrário
         """
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            if self.nodelay:
+                # Publicações são mensagens pequenas: desativa o algoritmo de Nagle
+                self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                # ACKs imediatos (apenas Linux)
+                if hasattr(socket, "TCP_QUICKACK"):
+                    try:
+                        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+                    except OSError:
+                        pass
+            # Detecção de conexão meio aberta pelo próprio kernel
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            if hasattr(socket, "TCP_USER_TIMEOUT"):
+                try:
+                    self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT, TCP_USER_TIMEOUT_MS)
+                except OSError:
+                    pass
+            # Buffers maiores evitam que rajadas de publicação travem no envio;
+            # definidos antes do connect para valerem na negociação da janela
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.sndbuf)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
+            self.applied_sndbuf = self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)
+            self.applied_rcvbuf = self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
             self.socket.connect((self.host, self.port))
             self.connected = True
             self.running = True
 
+            # Envios passam por uma fila consumida pela thread escritora, que
+            # agrupa o que estiver pendente em um único sendall
+            self._out_q = queue.Queue(maxsize=self.SEND_QUEUE_SIZE)
+            self._writer_thread = threading.Thread(target=self._write_loop, name="news-pub-tx")
+            self._writer_thread.daemon = True
+            self._writer_thread.start()
+
             # Inicia thread para receber respostas
-            receive_thread = threading.Thread(target=self._receive_messages)
-            receive_thread.daemon = True
-            receive_thread.start()
+            if start_receiver:
+                self._start_receiver()
 
             return True
 
@@ -101,20 +240,34 @@ class NewsPublisher:
 
     def disconnect(self):
         """Desconecta do servidor"""
-        if self.connected:
-            try:
-                self._send_message(Message.create(MessageType.DISCONNECT))
-            except:
-                pass
+        was_connected = self.connected
+        if was_connected:
+            self._send_bytes(Message.DISCONNECT_BYTES)
+        self._stop_writer()
 
         self.running = False
         self.connected = False
 
         if self.socket:
             try:
-                self.socket.close()
-            except:
+                if was_connected:
+                    # Envia FIN e aguarda brevemente o servidor encerrar; a
+                    # thread de recepção sai pelo caminho de EOF
+                    self.socket.shutdown(socket.SHUT_WR)
+                    self._wait_server_close(0.1)
+                # Acorda um recv ainda bloqueado na thread de recepção
+                self.socket.shutdown(socket.SHUT_RD)
+            except OSError:
                 pass
+            self.socket.close()
+
+        # Aguarda a thread de recepção terminar para não deixar threads
+        # antigas vivas entre conexões
+        receiver = self._receive_thread
+        if receiver is not None:
+            if receiver is not threading.current_thread():
+                receiver.join(1.0)
+            self._receive_thread = None
 
         if RICH_AVAILABLE:
             console.print(f"\n[yellow]📊 Total de notícias publicadas:[/yellow] {self.news_published}")
@@ -123,29 +276,66 @@ class NewsPublisher:
             print(f"\n📊 Total de notícias publicadas: {self.news_published}")
             print("\nDesconectado do servidor")
 
+    def _start_receiver(self):
+        """Inicia a thread de recepção, se ainda não houver uma ativa"""
+        if self._receive_thread is not None and self._receive_thread.is_alive():
+            return
+
+        self._receive_thread = threading.Thread(target=self._receive_messages, name="news-pub-rx")
+        self._receive_thread.daemon = True
+        self._receive_thread.start()
+
+    def _wait_server_close(self, timeout: float):
+        """
+        Aguarda o servidor fechar a conexão após o DISCONNECT.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+        """
+        if self._receive_thread is not None:
+            # A própria thread de recepção consome as respostas finais
+            self._receive_thread.join(timeout)
+            return
+
+        # Sem thread de recepção: descarta as respostas até o EOF
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            readable, _, _ = select.select([self.socket], [], [], remaining)
+            if not readable or not self.socket.recv_into(self._recv_mv):
+                break
+
     def _receive_messages(self):
         """Thread que recebe respostas do servidor"""
-        buffer = ""
+        # Buffer em bytes e posição do início da próxima mensagem
+        buffer = bytearray()
+        start = 0
 
         try:
             while self.running and self.connected:
-                data = self.socket.recv(BUFFER_SIZE).decode(ENCODING)
+                n = self.socket.recv_into(self._recv_mv)
 
-                if not data:
-                    if RICH_AVAILABLE:
-                        console.print("\n[yellow]Servidor desconectou[/yellow]")
-                    else:
-                        print("\nServidor desconectou")
+                if not n:
+                    # EOF após disconnect() é o encerramento normal
+                    if self.running:
+                        if RICH_AVAILABLE:
+                            console.print("\n[yellow]Servidor desconectou[/yellow]")
+                        else:
+                            print("\nServidor desconectou")
                     self.connected = False
                     break
 
-                buffer += data
-                messages = buffer.split('\n')
-                buffer = messages[-1]
+                # Bytes anteriores já foram varridos em busca de '\n'
+                scan = len(buffer)
+                buffer += self._recv_mv[:n]
+                start, _ = self._dispatch_frames(buffer, start, scan)
 
-                for raw_msg in messages[:-1]:
-                    if raw_msg.strip():
-                        self._handle_message(raw_msg)
+                # Descarta o trecho já processado só quando ele cresce
+                if start > 4096:
+                    del buffer[:start]
+                    start = 0
 
         except ConnectionResetError:
             if RICH_AVAILABLE:
@@ -161,6 +351,73 @@ class NewsPublisher:
                     print(f"\nErro ao receber mensagem: {e}")
                 self.connected = False
 
+    def _dispatch_frames(self, buffer: bytearray, start: int, scan: int = None) -> tuple:
+        """
+        Processa as mensagens completas presentes no buffer.
+
+        Args:
+            buffer: Bytes recebidos
+            start: Posição do início da próxima mensagem
+            scan: Posição a partir da qual procurar o terminador (os bytes
+                anteriores já foram varridos); padrão é start
+
+        Returns:
+            Tupla (nova posição inicial, quantidade de mensagens processadas)
+        """
+        count = 0
+
+        # Decodifica apenas mensagens completas
+        idx = buffer.find(b'\n', start if scan is None else scan)
+        while idx != -1:
+            frame = bytes(buffer[start:idx])
+            start = idx + 1
+            if frame.strip():
+                self._handle_message(frame.decode(ENCODING))
+                count += 1
+            idx = buffer.find(b'\n', start)
+
+        return start, count
+
+    def _drain_replies(self, expected: int, timeout: float = 2.0):
+        """
+        Lê respostas pendentes do servidor quando não há thread de recepção.
+
+        Args:
+            expected: Quantidade de respostas aguardadas
+            timeout: Tempo máximo de espera em segundos
+        """
+        if not (self.connected and self.socket):
+            return
+
+        deadline = time.monotonic() + timeout
+        buffer = bytearray()
+        start = 0
+        received = 0
+
+        try:
+            while received < expected:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                # Espera com select: o timeout do socket não muda, porque a
+                # thread escritora envia pelo mesmo socket ao mesmo tempo
+                readable, _, _ = select.select([self.socket], [], [], remaining)
+                if not readable:
+                    break
+
+                n = self.socket.recv_into(self._recv_mv)
+                if not n:
+                    self.connected = False
+                    break
+
+                scan = len(buffer)
+                buffer += self._recv_mv[:n]
+                start, count = self._dispatch_frames(buffer, start, scan)
+                received += count
+        except (OSError, ValueError):
+            self.connected = False
+
     def _handle_message(self, raw_message: str):
         """
         Processa respostas recebidas do servidor.
@@ -168,57 +425,146 @@ class NewsPublisher:
         Args:
             raw_message: Mensagem bruta recebida
         """
-        msg = Message.parse(raw_message)
-        msg_type = msg.get("type")
-        data = msg.get("data", {})
+        # Caminho rápido para confirmações e erros; qualquer formato
+        # inesperado segue para o parse completo
+        head = _REPLY_HEAD.match(raw_message)
+        if head is not None:
+            message = _extract_message(raw_message, head.end())
+            if message is not None:
+                if head.group(1) == MessageType.SUCCESS:
+                    self._show_success(message)
+                else:
+                    self._show_error(message)
+                return
 
-        if msg_type == MessageType.SUCCESS:
-            message = data.get("message", "")
-            if RICH_AVAILABLE:
-                console.print(f"[green]✓[/green] {message}")
-            else:
-                print(f"✓ {message}")
+        msg = Message.parse(raw_message)
+        handler = self._msg_handlers.get(msg.get("type"))
+        if handler is not None:
+            handler(msg.get("data", {}))
+
+    def _on_success(self, data: dict):
+        """Exibe confirmação do servidor"""
+        self._show_success(data.get("message", ""))
+
+    def _on_error(self, data: dict):
+        """Exibe erro informado pelo servidor"""
+        self._show_error(data.get("message", ""))
+
+    def _on_categories(self, data: dict):
+        """Exibe a lista de categorias disponíveis"""
+        categories = data.get("categories", [])
+        display_categories_rich(categories)
+        # Adiciona quebra de linha após as categorias
+        print()
 
-        elif msg_type == MessageType.ERROR:
-            message = data.get("message", "")
-            if RICH_AVAILABLE:
-                console.print(f"[red]✗[/red] {message}")
-            else:
-                print(f"✗ {message}")
+    def _on_history(self, data: dict):
+        """Entrega o histórico a _interactive_remove ou o exibe"""
+        news_list = data.get("news", [])
 
-        elif msg_type == MessageType.CATEGORIES_LIST:
-            categories = data.get("categories", [])
-            display_categories_rich(categories)
-            # Adiciona quebra de linha após as categorias
-            print()
+        # Se estiver esperando lista para remover, armazena
+        if self.waiting_for_news_list:
+            self.pending_news_list = news_list
+            self.waiting_for_news_list = False
+            self._news_list_event.set()
+        else:
+            # Exibição normal do histórico
+            display_history_rich(news_list, mode='detailed')
 
-        elif msg_type == MessageType.NEWS_HISTORY:
-            news_list = data.get("news", [])
+    def _show_success(self, message: str):
+        """Exibe uma mensagem de sucesso"""
+        _say(_OK_FORMAT.format(message))
 
-            # Se estiver esperando lista para remover, armazena
-            if self.waiting_for_news_list:
-                self.pending_news_list = news_list
-                self.waiting_for_news_list = False
-            else:
-                # Exibição normal do histórico
-                display_history_rich(news_list, mode='detailed')
+    def _show_error(self, message: str):
+        """Exibe uma mensagem de erro"""
+        _say(_ERR_FORMAT.format(message))
 
-    def _send_message(self, message: str):
+    def _send_message(self, message: str) -> bool:
         """
         Envia uma mensagem para o servidor.
 
         Args:
             message: Mensagem a enviar
+
+        Returns:
+            True se a mensagem entrou na fila de envio
+        """
+        return self._send_bytes(message.encode(ENCODING))
+
+    def _send_bytes(self, data):
         """
-        if self.connected and self.socket:
+        Envia dados já codificados para o servidor.
+
+        Args:
+            data: Uma ou mais mensagens em bytes (com terminador), ou uma
+                lista de mensagens em bytes a enviar em sequência
+
+        Returns:
+            True se os dados entraram na fila de envio; False se a conexão
+            caiu antes (os dados são descartados)
+        """
+        # Fila cheia bloqueia quem envia até a thread escritora escoar; se a
+        # escritora morrer (erro de envio), ninguém mais escoa a fila, então a
+        # espera é em intervalos e termina quando a conexão cai
+        while self.connected and self.socket:
             try:
-                self.socket.sendall(message.encode(ENCODING))
+                self._out_q.put(data, timeout=self.SEND_QUEUE_POLL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _write_loop(self):
+        """Thread escritora: envia os dados enfileirados, agrupando os pendentes"""
+        out_q = self._out_q
+        stop = False
+        while not stop:
+            data = out_q.get()
+            if data is None:
+                break
+
+            # Reúne tudo o que já estiver na fila para uma única chamada
+            buffers = []
+            try:
+                while True:
+                    if type(data) is list:
+                        buffers.extend(data)
+                    else:
+                        buffers.append(data)
+                    data = out_q.get_nowait()
+                    if data is None:
+                        stop = True
+                        break
+            except queue.Empty:
+                pass
+
+            try:
+                send_buffers(self.socket, buffers)
             except Exception as e:
                 if RICH_AVAILABLE:
                     console.print(f"[red]Erro ao enviar mensagem:[/red] {e}")
                 else:
                     print(f"Erro ao enviar mensagem: {e}")
                 self.connected = False
+                break
+
+    def _stop_writer(self, timeout: float = 1.0):
+        """
+        Encerra a thread escritora após enviar o que estiver na fila.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+        """
+        writer = self._writer_thread
+        if writer is None:
+            return
+        self._writer_thread = None
+
+        try:
+            # Sentinela: a thread sai depois de enviar os itens anteriores
+            self._out_q.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        writer.join(timeout)
 
     def publish_news(self, title: str, lead: str, category: str):
         """
@@ -230,12 +576,64 @@ class NewsPublisher:
             category: Categoria da notícia
         """
         message = Message.publish_news(title, lead, category)
-        self._send_message(message)
-        self.news_published += 1
+        if self._send_message(message):
+            self.news_published += 1
+
+    @staticmethod
+    def _news_columns(news_list: list) -> tuple:
+        """
+        Separa os campos das notícias em colunas, lendo cada dicionário uma vez.
+
+        Args:
+            news_list: Lista de dicionários com title, lead, category
+
+        Returns:
+            Tupla (títulos, leads, categorias), cada um uma tupla
+        """
+        fields = [
+            (news.get("title", ""), news.get("lead", ""), news.get("category", ""))
+            for news in news_list
+        ]
+        if not fields:
+            return (), (), ()
+        return tuple(zip(*fields))
+
+    @staticmethod
+    def _encode_columns(titles: tuple, leads: tuple, categories: tuple) -> list:
+        """
+        Serializa e codifica as mensagens de publicação a partir das colunas.
+
+        Args:
+            titles: Títulos das notícias
+            leads: Leads das notícias
+            categories: Categorias das notícias
+
+        Returns:
+            Lista de mensagens em bytes
+        """
+        publish = Message.publish_news
+        return [
+            publish(title, lead, category).encode(ENCODING)
+            for title, lead, category in zip(titles, leads, categories)
+        ]
+
+    def _send_frames(self, frames: list):
+        """
+        Envia mensagens de publicação já codificadas de uma só vez.
+
+        Args:
+            frames: Lista de mensagens em bytes
+        """
+        if not frames:
+            return
+
+        # A lista vai inteira para a thread escritora, que a envia com sendmsg
+        if self._send_bytes(list(frames)):
+            self.news_published += len(frames)
 
     def list_categories(self):
         """Lista categorias disponíveis"""
-        self._send_message(Message.create(MessageType.LIST_CATEGORIES))
+        self._send_bytes(Message.LIST_CATEGORIES_BYTES)
 
     def request_history(self, category: str = None, limit: int = 10):
         """Solicita histórico de notícias"""
@@ -243,7 +641,7 @@ class NewsPublisher:
 
     def clear_history(self):
         """Limpa o histórico de notícias"""
-        self._send_message(Message.create(MessageType.CLEAR_HISTORY))
+        self._send_bytes(Message.CLEAR_HISTORY_BYTES)
 
     def remove_news(self, news_ids: list):
         """Remove notícias específicas pelo ID"""
@@ -270,6 +668,17 @@ class NewsPublisher:
             print("="*60)
             print("\n💡 Digite HELP para ver comandos\n")
 
+        if self.prompt_session:
+            from prompt_toolkit.patch_stdout import patch_stdout
+
+            # Respostas da thread de recepção são impressas acima do prompt
+            with patch_stdout():
+                self._command_loop()
+        else:
+            self._command_loop()
+
+    def _command_loop(self):
+        """Laço de leitura e execução de comandos do editor"""
         try:
             while self.connected:
                 try:
@@ -305,75 +714,83 @@ class NewsPublisher:
         Args:
             command: Comando digitado
         """
-        cmd = normalize_command(command.split()[0])
-
-        if cmd == "PUBLICAR":
-            self._interactive_publish()
+        parts = command.split(maxsplit=1)
+        handler = self._command_handlers.get(normalize_command(parts[0]))
 
-        elif cmd == "LISTAR":
-            self.list_categories()
-
-        elif cmd.startswith("HISTORICO"):
-            parts = command.split(maxsplit=1)
-            args = parts[1] if len(parts) > 1 else ""
+        if handler is not None:
+            handler(parts)
+        else:
+            if RICH_AVAILABLE:
+                console.print(f"[red]✗[/red] Comando desconhecido: [bold]{parts[0]}[/bold]")
+                console.print("[yellow]💡 Digite HELP para ver comandos[/yellow]")
+            else:
+                print(f"✗ Comando desconhecido: {parts[0]}")
+                print("💡 Digite HELP para ver comandos")
 
-            category = None
-            limit = 10
+    def _cmd_publish(self, parts: list):
+        """Comando PUBLICAR"""
+        self._interactive_publish()
 
-            if args:
-                arg_parts = args.split()
-                if arg_parts[0].isdigit():
-                    limit = int(arg_parts[0])
-                else:
-                    category = normalize_category(arg_parts[0])
-                    if len(arg_parts) > 1 and arg_parts[1].isdigit():
-                        limit = int(arg_parts[1])
+    def _cmd_list(self, parts: list):
+        """Comando LISTAR"""
+        self.list_categories()
 
-            self.request_history(category, limit)
+    def _cmd_history(self, parts: list):
+        """Comando HISTORICO"""
+        args = parts[1] if len(parts) > 1 else ""
 
-        elif cmd == "REMOVER":
-            self._interactive_remove()
+        category = None
+        limit = 10
 
-        elif cmd == "LIMPAR":
-            if RICH_AVAILABLE:
-                console.print("[yellow]⚠️  Isso irá limpar TODO o histórico de notícias.[/yellow]")
-                console.print("[cyan]Tem certeza? (s/N):[/cyan] ", end="")
+        if args:
+            # Só os dois primeiros argumentos importam
+            arg_parts = args.split(maxsplit=2)
+            if arg_parts[0].isdigit():
+                limit = int(arg_parts[0])
             else:
-                print("⚠️  Isso irá limpar TODO o histórico de notícias.")
-                print("Tem certeza? (s/N): ", end="")
+                category = normalize_category(arg_parts[0])
+                if len(arg_parts) > 1 and arg_parts[1].isdigit():
+                    limit = int(arg_parts[1])
 
-            confirm = input().strip().lower()
-            if confirm in ['s', 'sim', 'y', 'yes']:
-                self.clear_history()
-            else:
-                if RICH_AVAILABLE:
-                    console.print("[yellow]Operação cancelada.[/yellow]")
-                else:
-                    print("Operação cancelada.")
+        self.request_history(category, limit)
 
-        elif cmd == "HELP":
-            self._show_help()
+    def _cmd_remove(self, parts: list):
+        """Comando REMOVER"""
+        self._interactive_remove()
 
-        elif cmd == "SAIR":
-            if RICH_AVAILABLE:
-                console.print("[yellow]Desconectando...[/yellow]")
-            else:
-                print("Desconectando...")
-            self.running = False
-            self.connected = False
+    def _cmd_clear(self, parts: list):
+        """Comando LIMPAR"""
+        if RICH_AVAILABLE:
+            console.print("[yellow]⚠️  Isso irá limpar TODO o histórico de notícias.[/yellow]")
+            console.print("[cyan]Tem certeza? (s/N):[/cyan] ", end="")
+        else:
+            print("⚠️  Isso irá limpar TODO o histórico de notícias.")
+            print("Tem certeza? (s/N): ", end="")
 
+        confirm = input().strip().lower()
+        if confirm in ['s', 'sim', 'y', 'yes']:
+            self.clear_history()
         else:
             if RICH_AVAILABLE:
-                console.print(f"[red]✗[/red] Comando desconhecido: [bold]{command.split()[0]}[/bold]")
-                console.print("[yellow]💡 Digite HELP para ver comandos[/yellow]")
+                console.print("[yellow]Operação cancelada.[/yellow]")
             else:
-                print(f"✗ Comando desconhecido: {command.split()[0]}")
-                print("💡 Digite HELP para ver comandos")
+                print("Operação cancelada.")
+
+    def _cmd_help(self, parts: list):
+        """Comando HELP"""
+        self._show_help()
+
+    def _cmd_quit(self, parts: list):
+        """Comando SAIR"""
+        if RICH_AVAILABLE:
+            console.print("[yellow]Desconectando...[/yellow]")
+        else:
+            print("Desconectando...")
+        self.running = False
+        self.connected = False
 
     def _interactive_remove(self):
         """Modo interativo para remover notícias específicas"""
-        import time
-
         try:
             if RICH_AVAILABLE:
                 console.print("\n[yellow]Carregando histórico de notícias...[/yellow]")
@@ -381,22 +798,14 @@ class NewsPublisher:
                 print("\nCarregando histórico de notícias...")
 
             # Solicita histórico completo
-            self.waiting_for_news_list = True
             self.pending_news_list = None
+            self._news_list_event.clear()
+            self.waiting_for_news_list = True
             self.request_history(category=None, limit=100)
 
-            # Aguarda a resposta (com timeout)
-            max_wait = 5  # segundos
-            waited = 0
-            while self.waiting_for_news_list and waited < max_wait:
-                time.sleep(0.1)
-                waited += 0.1
-
-            if self.waiting_for_news_list or not self.pending_news_list:
-                if RICH_AVAILABLE:
-                    console.print("[red]✗[/red] Timeout ao carregar histórico")
-                else:
-                    print("✗ Timeout ao carregar histórico")
+            # Aguarda a resposta (com timeout) sem polling
+            if not self._news_list_event.wait(timeout=5.0):
+                self._show_error("Timeout ao carregar histórico")
                 self.waiting_for_news_list = False
                 return
 
@@ -422,9 +831,14 @@ class NewsPublisher:
                 table.add_column("Título", width=40)
                 table.add_column("Data", width=16)
 
+                # Referências locais para o laço de até 100 linhas
+                fromisoformat = datetime.fromisoformat
+                emojis = CATEGORY_EMOJIS
+                add_row = table.add_row
+
                 for idx, news in enumerate(news_list, 1):
                     news_id = news.get("id", "?")
-                    category = news.get("category", "").upper()
+                    category = news.get("category", "")
                     title = news.get("title", "")
                     timestamp = news.get("timestamp", "")
 
@@ -435,14 +849,12 @@ class NewsPublisher:
                     # Formata timestamp
                     if timestamp:
                         try:
-                            from datetime import datetime
-                            dt = datetime.fromisoformat(timestamp)
-                            timestamp = dt.strftime("%d/%m/%y %H:%M")
-                        except:
+                            timestamp = fromisoformat(timestamp).strftime("%d/%m/%y %H:%M")
+                        except (TypeError, ValueError):
                             pass
 
-                    emoji = CATEGORY_EMOJIS.get(category.lower(), '📰')
-                    table.add_row(str(idx), str(news_id), f"{emoji} {category}", title, timestamp)
+                    emoji = emojis.get(category, '📰')
+                    add_row(str(idx), str(news_id), f"{emoji} {category.upper()}", title, timestamp)
 
                 console.print("\n")
                 console.print(Panel(table, title="[bold green]Histórico de Notícias[/bold green]", border_style="green"))
@@ -450,11 +862,10 @@ class NewsPublisher:
                 print("\n" + "="*80)
                 print("HISTÓRICO DE NOTÍCIAS")
                 print("="*80)
-                for idx, news in enumerate(news_list, 1):
-                    news_id = news.get("id", "?")
-                    category = news.get("category", "").upper()
-                    title = news.get("title", "")
-                    print(f"{idx}. [ID:{news_id}] [{category}] {title}")
+                print("\n".join(
+                    f"{idx}. [ID:{news.get('id', '?')}] [{news.get('category', '').upper()}] {news.get('title', '')}"
+                    for idx, news in enumerate(news_list, 1)
+                ))
                 print("="*80)
 
             # Solicita números para remover
@@ -501,10 +912,7 @@ class NewsPublisher:
                         print(f"⚠️  '{part}' não é um número válido")
 
             if not selected_indices:
-                if RICH_AVAILABLE:
-                    console.print("[red]✗[/red] Nenhuma notícia válida selecionada")
-                else:
-                    print("✗ Nenhuma notícia válida selecionada")
+                self._show_error("Nenhuma notícia válida selecionada")
                 return
 
             # Converte índices para IDs
@@ -598,10 +1006,7 @@ class NewsPublisher:
             title = title.strip()
 
             if not title:
-                if RICH_AVAILABLE:
-                    console.print("[red]✗[/red] Título não pode ser vazio")
-                else:
-                    print("✗ Título não pode ser vazio")
+                self._show_error("Título não pode ser vazio")
                 return
 
             # Lead
@@ -612,10 +1017,7 @@ class NewsPublisher:
             lead = lead.strip()
 
             if not lead:
-                if RICH_AVAILABLE:
-                    console.print("[red]✗[/red] Lead não pode ser vazio")
-                else:
-                    print("✗ Lead não pode ser vazio")
+                self._show_error("Lead não pode ser vazio")
                 return
 
             # Categoria
@@ -624,25 +1026,20 @@ class NewsPublisher:
 
             if self.prompt_session:
                 # Autocomplete para categorias
-                cat_completer = WordCompleter(list(DEFAULT_CATEGORIES), ignore_case=True)
-                cat_session = PromptSession(completer=cat_completer)
-                category = cat_session.prompt('Categoria: ')
+                category = self._cat_session.prompt('Categoria: ')
             else:
                 category = input("Categoria: ")
 
             category = category.strip().lower()
 
             if not category:
-                if RICH_AVAILABLE:
-                    console.print("[red]✗[/red] Categoria não pode ser vazia")
-                else:
-                    print("✗ Categoria não pode ser vazia")
+                self._show_error("Categoria não pode ser vazia")
                 return
 
             # Normaliza e valida categoria
             normalized_cat = normalize_category(category)
 
-            if normalized_cat not in DEFAULT_CATEGORIES:
+            if normalized_cat not in DEFAULT_CATEGORIES_SET:
                 # Tenta sugerir
                 suggestion = suggest_category(normalized_cat, DEFAULT_CATEGORIES)
 
@@ -665,10 +1062,7 @@ class NewsPublisher:
                         return
                 else:
                     # Sem sugestão, mostra categorias disponíveis
-                    if RICH_AVAILABLE:
-                        console.print(f"[red]✗[/red] Categoria '{category}' não existe.")
-                    else:
-                        print(f"✗ Categoria '{category}' não existe.")
+                    self._show_error(f"Categoria '{category}' não existe.")
 
                     display_categories_rich(list(DEFAULT_CATEGORIES))
 
@@ -725,47 +1119,74 @@ class NewsPublisher:
             else:
                 print("\nPublicação cancelada")
 
-    def run_automated(self, news_list: list):
+    def run_automated(self, news_list: list, rate: float = None, batch: int = None):
         """
         Publica notícias automaticamente a partir de uma lista.
 
         Args:
             news_list: Lista de dicionários com title, lead, category
+            rate: Notícias por segundo; se None, publica sem pausas
+            batch: Notícias por envio quando não há taxa definida
+                (padrão: PUBLISH_BATCH_SIZE)
         """
-        if not self.connect():
+        # Sem thread de recepção: as confirmações são lidas ao final
+        if not self.connect(start_receiver=False):
             return
 
-        import time
+        published_before = self.news_published
 
         if RICH_AVAILABLE:
             console.print(f"[yellow]📤 Modo automático - {len(news_list)} notícias para publicar[/yellow]\n")
         else:
             print(f"📤 Modo automático - {len(news_list)} notícias para publicar\n")
 
-        for i, news in enumerate(news_list, 1):
+        total = len(news_list)
+        # Com taxa definida, cada notícia é enviada no seu horário
+        delay = 1.0 / rate if rate else 0.0
+        batch_size = 1 if delay else max(1, batch or self.PUBLISH_BATCH_SIZE)
+        next_send = time.monotonic()
+
+        # Todas as mensagens são montadas de uma vez, antes dos envios; os
+        # campos são lidos dos dicionários uma única vez
+        titles, leads, categories = self._news_columns(news_list)
+        frames = self._encode_columns(titles, leads, categories)
+        short_titles = [title[:50] for title in titles]
+
+        # Envia as notícias em lotes, cada lote com um único sendall
+        for start in range(0, total, batch_size):
             if not self.connected:
                 break
 
-            title = news.get("title", "")
-            lead = news.get("lead", "")
-            category = news.get("category", "")
+            if delay:
+                # Agenda pelo horário previsto, sem acumular atrasos
+                wait = next_send - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                next_send += delay
 
+            # Progresso do lote montado antes e escrito de uma só vez
+            progress = enumerate(short_titles[start:start + batch_size], start + 1)
             if RICH_AVAILABLE:
-                console.print(f"[{i}/{len(news_list)}] Publicando: [bold]{title[:50]}[/bold]...")
+                console.print("\n".join(
+                    f"[{i}/{total}] Publicando: [bold]{title}[/bold]..."
+                    for i, title in progress
+                ))
             else:
-                print(f"[{i}/{len(news_list)}] Publicando: {title[:50]}...")
-
-            self.publish_news(title, lead, category)
+                sys.stdout.write("".join(
+                    f"[{i}/{total}] Publicando: {title}...\n"
+                    for i, title in progress
+                ))
 
-            # Aguarda um pouco entre publicações
-            time.sleep(1)
+            self._send_frames(frames[start:start + batch_size])
 
         if RICH_AVAILABLE:
             console.print("\n[green]✓ Publicação automática concluída[/green]")
         else:
             print("\n✓ Publicação automática concluída")
 
-        time.sleep(1)
+        # Recolhe as confirmações (e eventuais erros) antes de desconectar;
+        # a primeira resposta é a mensagem de boas-vindas do servidor
+        self._drain_replies(1 + self.news_published - published_before)
         self.disconnect()
 
 
@@ -777,6 +1198,10 @@ def main():
     parser.add_argument("--host", default=DEFAULT_HOST, help="Host do servidor")
     parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Porta do servidor")
     parser.add_argument("--auto", action="store_true", help="Modo automático com notícias de exemplo")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="Notícias por segundo no modo automático (padrão: sem limite)")
+    parser.add_argument("--batch", type=int, default=None,
+                        help="Notícias por envio no modo automático sem --rate")
 
     args = parser.parse_args()
 
@@ -811,7 +1236,7 @@ def main():
                 "category": "entretenimento"
             }
         ]
-        publisher.run_automated(sample_news)
+        publisher.run_automated(sample_news, rate=args.rate, batch=args.batch)
     else:
         publisher.run_interactive()
 
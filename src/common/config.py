@@ -5,11 +5,14 @@ Configurações do sistema PUB/SUB de notícias.
 # Configurações de rede
 DEFAULT_HOST = "localhost"
 DEFAULT_PORT = 5555
-BUFFER_SIZE = 4096
+BUFFER_SIZE = 65536  # Bytes lidos por chamada de recv
+SOCKET_BUFFER_SIZE = 1 << 20  # SO_SNDBUF/SO_RCVBUF dos sockets (1 MiB)
+TCP_USER_TIMEOUT_MS = 30000  # Tempo máximo sem ACK antes de derrubar a conexão
+CLIENT_SEND_TIMEOUT = 5  # Segundos que um envio ao cliente pode ficar parado (SO_SNDTIMEO)
 ENCODING = "utf-8"
 
-# Categorias disponíveis
-DEFAULT_CATEGORIES = [
+# Categorias disponíveis (tupla: a ordem é usada na exibição)
+DEFAULT_CATEGORIES = (
     "todas",
     "tecnologia",
     "esportes",
@@ -26,8 +29,10 @@ DEFAULT_CATEGORIES = [
     "viagem",
     "negocios",
     "meio-ambiente"
-]
+)
+# Mesmas categorias, para testes de pertinência em O(1)
+DEFAULT_CATEGORIES_SET = frozenset(DEFAULT_CATEGORIES)
 
 # Configurações de armazenamento
-NEWS_STORAGE_FILE = "data/news.json"
+NEWS_STORAGE_FILE = "data/news.jsonl"  # Uma notícia JSON por linha
 MAX_NEWS_HISTORY = 100  # Máximo de notícias armazenadas
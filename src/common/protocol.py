@@ -4,7 +4,35 @@ Define os comandos e formato das mensagens trocadas entre cliente e servidor.
 """
 
 import json
-from typing import Dict, Any, List
+from json.encoder import encode_basestring
+from typing import Dict, Any, List, Union
+
+from common.config import ENCODING
+
+# orjson é opcional: decodifica e serializa bem mais rápido que o json padrão
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    # Aceita str ou bytes e ignora espaços nas extremidades
+    _decode = orjson.loads
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode(ENCODING)
+else:
+    # Decodificador reutilizado; decode() já ignora espaços nas extremidades
+    _decode_str = json.JSONDecoder().decode
+
+    def _decode(raw):
+        if type(raw) is not str:
+            raw = str(raw, ENCODING)
+        return _decode_str(raw)
+
+    def _dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False)
 
 
 class MessageType:
@@ -29,6 +57,25 @@ class MessageType:
     CATEGORIES_LIST = "CATEGORIAS"
 
 
+def _json_value(value) -> str:
+    """Serializa um valor de campo; strings usam o escape direto do json"""
+    if type(value) is str:
+        return encode_basestring(value)
+    return _dumps(value)
+
+
+# Modelos das mensagens mais frequentes, no mesmo formato de json.dumps: só
+# os valores são serializados, sem montar dicionários a cada mensagem
+_NEWS_TEMPLATE = '{"type": "%s", "data": {"title": %%s, "lead": %%s, "category": %%s}}\n'
+_PUBLISH_TEMPLATE = _NEWS_TEMPLATE % MessageType.PUBLISH
+_NEWS_UPDATE_TEMPLATE = _NEWS_TEMPLATE % MessageType.NEWS_UPDATE
+_SUCCESS_TEMPLATE = '{"type": "%s", "data": {"message": %%s}}\n' % MessageType.SUCCESS
+_ERROR_TEMPLATE = '{"type": "%s", "data": {"message": %%s}}\n' % MessageType.ERROR
+_SUBSCRIBE_TEMPLATE = '{"type": "%s", "data": {"category": %%s}}\n' % MessageType.SUBSCRIBE
+_UNSUBSCRIBE_TEMPLATE = '{"type": "%s", "data": {"category": %%s}}\n' % MessageType.UNSUBSCRIBE
+_CATEGORIES_TEMPLATE = '{"type": "%s", "data": {"categories": %%s}}\n' % MessageType.CATEGORIES_LIST
+
+
 class Message:
     """Classe para encapsular mensagens do protocolo"""
 
@@ -48,66 +95,69 @@ class Message:
             "type": msg_type,
             "data": data or {}
         }
-        return json.dumps(message, ensure_ascii=False) + "\n"
+        return _dumps(message) + "\n"
 
     @staticmethod
-    def parse(raw_message: str) -> Dict[str, Any]:
+    def parse(raw_message: Union[str, bytes, bytearray, memoryview]) -> Dict[str, Any]:
         """
         Faz parse de uma mensagem recebida.
 
         Args:
-            raw_message: String JSON da mensagem
+            raw_message: Mensagem JSON, como str ou já em bytes (com orjson,
+                os bytes são lidos direto, sem decodificar para str antes)
 
         Returns:
             Dicionário com type e data
         """
         try:
-            return json.loads(raw_message.strip())
-        except json.JSONDecodeError:
+            return _decode(raw_message)
+        except (json.JSONDecodeError, UnicodeDecodeError):
             return {"type": MessageType.ERROR, "data": {"message": "Formato inválido"}}
 
     @staticmethod
     def subscribe(category: str) -> str:
         """Cria mensagem de inscrição em categoria"""
-        return Message.create(MessageType.SUBSCRIBE, {"category": category})
+        return _SUBSCRIBE_TEMPLATE % _json_value(category)
 
     @staticmethod
     def unsubscribe(category: str) -> str:
         """Cria mensagem de remoção de inscrição"""
-        return Message.create(MessageType.UNSUBSCRIBE, {"category": category})
+        return _UNSUBSCRIBE_TEMPLATE % _json_value(category)
+
+    @staticmethod
+    def subscribe_many(categories: List[str]) -> str:
+        """Cria uma única mensagem de inscrição em várias categorias"""
+        return Message.create(MessageType.SUBSCRIBE, {"categories": list(categories)})
+
+    @staticmethod
+    def unsubscribe_many(categories: List[str]) -> str:
+        """Cria uma única mensagem de remoção de várias inscrições"""
+        return Message.create(MessageType.UNSUBSCRIBE, {"categories": list(categories)})
 
     @staticmethod
     def publish_news(title: str, lead: str, category: str) -> str:
         """Cria mensagem de publicação de notícia"""
-        return Message.create(MessageType.PUBLISH, {
-            "title": title,
-            "lead": lead,
-            "category": category
-        })
+        return _PUBLISH_TEMPLATE % (_json_value(title), _json_value(lead), _json_value(category))
 
     @staticmethod
     def news_update(title: str, lead: str, category: str) -> str:
         """Cria mensagem de atualização de notícia para cliente"""
-        return Message.create(MessageType.NEWS_UPDATE, {
-            "title": title,
-            "lead": lead,
-            "category": category
-        })
+        return _NEWS_UPDATE_TEMPLATE % (_json_value(title), _json_value(lead), _json_value(category))
 
     @staticmethod
     def success(message: str) -> str:
         """Cria mensagem de sucesso"""
-        return Message.create(MessageType.SUCCESS, {"message": message})
+        return _SUCCESS_TEMPLATE % _json_value(message)
 
     @staticmethod
     def error(message: str) -> str:
         """Cria mensagem de erro"""
-        return Message.create(MessageType.ERROR, {"message": message})
+        return _ERROR_TEMPLATE % _json_value(message)
 
     @staticmethod
     def categories_list(categories: List[str]) -> str:
         """Cria mensagem com lista de categorias"""
-        return Message.create(MessageType.CATEGORIES_LIST, {"categories": categories})
+        return _CATEGORIES_TEMPLATE % _dumps(categories)
 
     @staticmethod
     def request_history(category: str = None, limit: int = 10) -> str:
@@ -126,3 +176,9 @@ class Message:
     def remove_news(news_ids: List[int]) -> str:
         """Cria mensagem para remover notícias específicas"""
         return Message.create(MessageType.REMOVE_NEWS, {"news_ids": news_ids})
+
+
+# Mensagens sem parâmetros, serializadas e codificadas uma única vez
+Message.LIST_CATEGORIES_BYTES = Message.create(MessageType.LIST_CATEGORIES).encode(ENCODING)
+Message.DISCONNECT_BYTES = Message.create(MessageType.DISCONNECT).encode(ENCODING)
+Message.CLEAR_HISTORY_BYTES = Message.create(MessageType.CLEAR_HISTORY).encode(ENCODING)
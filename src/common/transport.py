@@ -0,0 +1,47 @@
+"""
+Envio de mensagens pelo socket, comum a cliente e servidor.
+"""
+
+import socket
+
+# Máximo de buffers por chamada de sendmsg (limite usual de IOV_MAX); acima
+# disso o Linux recusa a chamada com EMSGSIZE
+SENDMSG_MAX_BUFFERS = 1024
+
+
+def send_buffers(sock: socket.socket, buffers: list, flags: int = 0):
+    """
+    Envia uma sequência de mensagens, com sendmsg quando disponível.
+
+    O sendmsg entrega os buffers ao kernel sem concatená-los antes, no
+    máximo SENDMSG_MAX_BUFFERS por chamada; envios parciais continuam a
+    partir do byte seguinte.
+
+    Args:
+        sock: Socket de destino
+        buffers: Lista de mensagens em bytes
+        flags: Flags do envio (por exemplo, MSG_NOSIGNAL)
+    """
+    if len(buffers) == 1:
+        sock.sendall(buffers[0], flags)
+        return
+    if not hasattr(sock, "sendmsg"):
+        sock.sendall(b"".join(buffers), flags)
+        return
+
+    while buffers:
+        sent = sock.sendmsg(buffers[:SENDMSG_MAX_BUFFERS], (), flags)
+
+        # Descarta os buffers enviados por completo
+        done = 0
+        for buf in buffers:
+            size = len(buf)
+            if sent < size:
+                break
+            sent -= size
+            done += 1
+        buffers = buffers[done:]
+
+        # Buffer enviado pela metade: segue do ponto em que parou
+        if sent:
+            buffers[0] = memoryview(buffers[0])[sent:]
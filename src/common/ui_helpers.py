@@ -6,21 +6,57 @@ Inclui formatação, validação, e utilitários de UX.
 from typing import List, Optional, Dict, Any
 from difflib import get_close_matches
 from datetime import datetime
+from functools import lru_cache
+import importlib.util
 import os
+import sys
+import time
 
-try:
+# Rich é opcional. Só o Console é importado aqui (clientes já o usam na
+# inicialização); Panel, Table, Text e box vêm na primeira exibição que os usa
+RICH_AVAILABLE = importlib.util.find_spec("rich") is not None
+if RICH_AVAILABLE:
     from rich.console import Console
-    from rich.panel import Panel
-    from rich.table import Table
-    from rich.markdown import Markdown
-    from rich import box
-    RICH_AVAILABLE = True
+Panel = Table = Text = box = None
+
+# rapidfuzz é opcional: faz o fuzzy matching em C; sem ele, usa difflib
+try:
+    from rapidfuzz import fuzz, process as fuzz_process
+    RAPIDFUZZ_AVAILABLE = True
 except ImportError:
-    RICH_AVAILABLE = False
+    RAPIDFUZZ_AVAILABLE = False
 
 # Instância global do console Rich
 console = Console() if RICH_AVAILABLE else None
 
+
+def _load_rich():
+    """Importa os renderizáveis do Rich na primeira vez que são necessários"""
+    global Panel, Table, Text, box
+    if Panel is None:
+        from rich.table import Table
+        from rich.text import Text
+        from rich import box
+        from rich.panel import Panel
+
+
+# Intervalo mínimo entre dois sinais sonoros de notícia (segundos); uma
+# rajada de notícias produz um único som
+_BELL_INTERVAL = 0.5
+_last_bell = 0.0
+
+# Linha separadora e modelo da notícia no modo texto simples
+_SEPARATOR = '=' * 60
+_NEWS_TEMPLATE = (
+    "\n" + _SEPARATOR + "\n"
+    "📰 NOVA NOTÍCIA - [{category}]\n" +
+    _SEPARATOR + "\n"
+    "Título: {title}\n"
+    "Lead: {lead}\n"
+    "{date_line}" +
+    _SEPARATOR + "\n\n"
+)
+
 # Aliases de comandos
 COMMAND_ALIASES = {
     'INSCREVER': ['sub', 'subscribe', 'add', '+', 'inscrever'],
@@ -31,6 +67,13 @@ COMMAND_ALIASES = {
     'HELP': ['ajuda', 'help', '?']
 }
 
+# Índice reverso: comando ou alias (casefold) -> comando principal
+_COMMAND_LOOKUP = {
+    alias.casefold(): main_cmd
+    for main_cmd, aliases in COMMAND_ALIASES.items()
+    for alias in (main_cmd, *aliases)
+}
+
 # Emojis por categoria
 CATEGORY_EMOJIS = {
     'todas': '📰',
@@ -69,10 +112,21 @@ CATEGORY_ALIASES = {
     'entertainment': 'entretenimento'
 }
 
+# Nomes de categoria internados (ex.: 'meio-ambiente' não é internado pelo
+# compilador), para que comparações se resolvam pela identidade
+CATEGORY_EMOJIS = {sys.intern(cat): emoji for cat, emoji in CATEGORY_EMOJIS.items()}
+CATEGORY_ALIASES = {alias: sys.intern(cat) for alias, cat in CATEGORY_ALIASES.items()}
+
+# Índice único de categorias: nome canônico ou alias -> categoria
+_CATEGORY_LOOKUP = {cat: cat for cat in CATEGORY_EMOJIS}
+_CATEGORY_LOOKUP.update(CATEGORY_ALIASES)
 
+
+@lru_cache(maxsize=1024)
 def normalize_command(cmd: str) -> str:
     """
     Normaliza comando considerando aliases.
+    O resultado é memorizado: as entradas se repetem muito na prática.
 
     Args:
         cmd: Comando digitado pelo usuário
@@ -81,22 +135,20 @@ def normalize_command(cmd: str) -> str:
         Comando normalizado em MAIÚSCULAS
     """
     cmd_clean = cmd.strip()
-    cmd_upper = cmd_clean.upper()
 
-    # Verifica se é o comando principal
-    for main_cmd, aliases in COMMAND_ALIASES.items():
-        if cmd_upper == main_cmd:
-            return main_cmd
-        # Verifica aliases (case-insensitive)
-        if cmd_clean.lower() in [a.lower() for a in aliases]:
-            return main_cmd
+    # Comando principal ou alias (case-insensitive) numa única consulta
+    main_cmd = _COMMAND_LOOKUP.get(cmd_clean.casefold())
+    if main_cmd is not None:
+        return main_cmd
 
-    return cmd_upper
+    return cmd_clean.upper()
 
 
+@lru_cache(maxsize=1024)
 def normalize_category(category: str) -> str:
     """
     Normaliza categoria considerando aliases.
+    O resultado é memorizado: as entradas se repetem muito na prática.
 
     Args:
         category: Categoria digitada pelo usuário
@@ -106,11 +158,8 @@ def normalize_category(category: str) -> str:
     """
     cat_lower = category.strip().lower()
 
-    # Verifica se é um alias
-    if cat_lower in CATEGORY_ALIASES:
-        return CATEGORY_ALIASES[cat_lower]
-
-    return cat_lower
+    # Alias ou nome canônico numa única consulta
+    return _CATEGORY_LOOKUP.get(cat_lower, cat_lower)
 
 
 def suggest_category(input_cat: str, available_categories: List[str]) -> Optional[str]:
@@ -124,15 +173,46 @@ def suggest_category(input_cat: str, available_categories: List[str]) -> Optiona
     Returns:
         Categoria sugerida ou None
     """
-    # Primeiro tenta normalizar
-    normalized = normalize_category(input_cat)
-
-    if normalized in available_categories:
-        return normalized
+    # Tupla para servir de chave dos caches; conjuntos já servem para o
+    # teste de pertinência
+    categories = tuple(available_categories)
+    if isinstance(available_categories, (set, frozenset)):
+        available = available_categories
+    else:
+        available = _category_set(categories)
+
+    # Caminho rápido: categoria exata ou alias conhecido, sem fuzzy matching
+    cat_lower = input_cat.strip().lower()
+    if cat_lower in available:
+        return cat_lower
+    alias = CATEGORY_ALIASES.get(cat_lower)
+    if alias in available:
+        return alias
+
+    return _suggest_category(cat_lower, categories)
+
+
+@lru_cache(maxsize=16)
+def _category_set(available_categories: tuple) -> frozenset:
+    """Conjunto (memorizado) das categorias, para testes de pertinência em O(1)"""
+    return frozenset(available_categories)
+
+
+@lru_cache(maxsize=256)
+def _suggest_category(cat_lower: str, available_categories: tuple) -> Optional[str]:
+    """Fuzzy matching memorizado de suggest_category"""
+    # Mesmo limiar de similaridade nas duas implementações
+    if RAPIDFUZZ_AVAILABLE:
+        match = fuzz_process.extractOne(
+            cat_lower,
+            available_categories,
+            scorer=fuzz.ratio,
+            score_cutoff=60
+        )
+        return match[0] if match else None
 
-    # Fuzzy matching
     matches = get_close_matches(
-        input_cat.lower(),
+        cat_lower,
         available_categories,
         n=1,
         cutoff=0.6
@@ -141,6 +221,40 @@ def suggest_category(input_cat: str, available_categories: List[str]) -> Optiona
     return matches[0] if matches else None
 
 
+# Marcadores de inscrição, indexados por (categoria in assinaturas)
+_STATUS_MARKS = ("[dim]○[/dim]", "[green]✓[/green]") if RICH_AVAILABLE else ("○", "✓")
+
+# Última lista de assinaturas formatada: (conjunto, texto)
+_subs_cache = None
+
+
+def _subs_str(subscriptions) -> str:
+    """
+    Formata as assinaturas em ordem alfabética, reaproveitando o último
+    resultado enquanto o conjunto não muda.
+
+    Args:
+        subscriptions: Categorias inscritas
+
+    Returns:
+        Categorias separadas por vírgula
+    """
+    global _subs_cache
+    key = frozenset(subscriptions)
+    cache = _subs_cache
+    if cache is not None and cache[0] == key:
+        return cache[1]
+
+    text = ', '.join(sorted(key))
+    _subs_cache = (key, text)
+    return text
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Corta o texto em limit caracteres, acrescentando reticências"""
+    return text if len(text) <= limit else f"{text[:limit]}..."
+
+
 def display_news_rich(title: str, lead: str, category: str, timestamp: str = None):
     """
     Exibe notícia com formatação rica usando Rich.
@@ -152,39 +266,49 @@ def display_news_rich(title: str, lead: str, category: str, timestamp: str = Non
         timestamp: Timestamp da notícia (opcional)
     """
     if not RICH_AVAILABLE:
-        # Fallback para display simples
-        print(f"\n{'='*60}")
-        print(f"📰 NOVA NOTÍCIA - [{category.upper()}]")
-        print(f"{'='*60}")
-        print(f"Título: {title}")
-        print(f"Lead: {lead}")
-        if timestamp:
-            print(f"Data: {timestamp}")
-        print(f"{'='*60}\n")
+        # Fallback para display simples (uma única escrita)
+        print(_NEWS_TEMPLATE.format(
+            category=category.upper(),
+            title=title,
+            lead=lead,
+            date_line=f"Data: {timestamp}\n" if timestamp else ""
+        ), end="")
         return
 
+    _load_rich()
     emoji = CATEGORY_EMOJIS.get(category, '📰')
 
-    content = f"""
-# {emoji} {title}
-
-**Categoria:** {category.upper()}
-
-{lead}
-"""
+    # Texto com estilos montado diretamente, sem passar pelo parser de Markdown
+    content = Text.assemble(
+        (f"{emoji} {title}", "bold"),
+        "\n\n",
+        ("Categoria: ", "bold"),
+        category.upper(),
+        "\n\n",
+        lead
+    )
 
     if timestamp:
-        content += f"\n---\n*{timestamp}*"
-
-    console.print(Panel(
-        Markdown(content),
-        title="[bold yellow]NOVA NOTÍCIA[/bold yellow]",
-        border_style="bright_blue",
-        box=box.DOUBLE
-    ))
-
-    # Som de notificação
-    print('\a')
+        content.append("\n\n")
+        content.append(timestamp, style="italic dim")
+
+    global _last_bell
+    now = time.monotonic()
+    ring = now - _last_bell >= _BELL_INTERVAL
+    if ring:
+        _last_bell = now
+
+    # Painel e som de notificação saem numa única escrita
+    with console:
+        console.print(Panel(
+            content,
+            title="[bold yellow]NOVA NOTÍCIA[/bold yellow]",
+            border_style="bright_blue",
+            box=box.DOUBLE
+        ))
+        if ring:
+            console.bell()
+        console.line()
 
 
 def display_history_rich(news_list: List[Dict[str, Any]], mode: str = 'detailed'):
@@ -203,20 +327,22 @@ def display_history_rich(news_list: List[Dict[str, Any]], mode: str = 'detailed'
         return
 
     if not RICH_AVAILABLE:
-        # Display simples
-        print(f"\n{'='*60}")
-        print(f"📚 HISTÓRICO - {len(news_list)} notícia(s)")
-        print(f"{'='*60}")
+        # Display simples, montado por completo e escrito de uma só vez
+        emoji_get = CATEGORY_EMOJIS.get
+        dash_line = '-' * 60
+        lines = [f"\n{_SEPARATOR}", f"📚 HISTÓRICO - {len(news_list)} notícia(s)", _SEPARATOR]
         for news in news_list:
-            emoji = CATEGORY_EMOJIS.get(news['category'], '📰')
-            print(f"\n{emoji} [{news['category'].upper()}] {news['title']}")
-            print(f"   {news['lead']}")
-            print(f"   {news['timestamp'][:19].replace('T', ' ')}")
-            print(f"{'-'*60}")
-        print()
+            category = news['category']
+            lines.append(f"\n{emoji_get(category, '📰')} [{category.upper()}] {news['title']}")
+            lines.append(f"   {news['lead']}")
+            lines.append(f"   {news['timestamp'][:19].replace('T', ' ')}")
+            lines.append(dash_line)
+        lines.append("")
+        print("\n".join(lines))
         return
 
     # Display com Rich Table
+    _load_rich()
     table = Table(
         title=f"📚 Histórico de Notícias ({len(news_list)} notícia(s))",
         show_header=True,
@@ -231,14 +357,16 @@ def display_history_rich(news_list: List[Dict[str, Any]], mode: str = 'detailed'
         table.add_column("Lead", style="bright_black", width=40)
         table.add_column("Data", style="green", width=19)
 
+        emoji_get = CATEGORY_EMOJIS.get
+        trunc = _truncate
+        add_row = table.add_row
         for news in news_list:
-            emoji = CATEGORY_EMOJIS.get(news['category'], '📰')
-            lead_short = news['lead'][:40] + '...' if len(news['lead']) > 40 else news['lead']
-            table.add_row(
+            category = news['category']
+            add_row(
                 str(news['id']),
-                f"{emoji} {news['category'].upper()}",
-                news['title'][:30] + '...' if len(news['title']) > 30 else news['title'],
-                lead_short,
+                f"{emoji_get(category, '📰')} {category.upper()}",
+                trunc(news['title'], 30),
+                trunc(news['lead'], 40),
                 news['timestamp'][:19].replace('T', ' ')
             )
     else:  # detailed
@@ -246,11 +374,14 @@ def display_history_rich(news_list: List[Dict[str, Any]], mode: str = 'detailed'
         table.add_column("Título", style="white", width=40)
         table.add_column("Data", style="green", width=19)
 
+        emoji_get = CATEGORY_EMOJIS.get
+        trunc = _truncate
+        add_row = table.add_row
         for news in news_list:
-            emoji = CATEGORY_EMOJIS.get(news['category'], '📰')
-            table.add_row(
-                f"{emoji} {news['category'].upper()}",
-                news['title'][:40] + '...' if len(news['title']) > 40 else news['title'],
+            category = news['category']
+            add_row(
+                f"{emoji_get(category, '📰')} {category.upper()}",
+                trunc(news['title'], 40),
                 news['timestamp'][:19].replace('T', ' ')
             )
 
@@ -278,51 +409,33 @@ def display_categories_rich(categories: List[str], subscriptions: set = None):
     else:
         print("\n📂 Categorias Disponíveis:\n")
 
+    emoji_get = CATEGORY_EMOJIS.get
+    marks = _STATUS_MARKS
+    lines = []
+
     # Exibe "todas" como item 0 se existir
     if has_todas:
-        emoji = CATEGORY_EMOJIS.get('todas', '📌')
-        status = "[green]✓[/green]" if 'todas' in subscriptions else ("[dim]○[/dim]" if RICH_AVAILABLE else "○")
-
-        if RICH_AVAILABLE:
-            console.print(f"  0. {status} {emoji} Todas")
-        else:
-            print(f"  0. {status} {emoji} Todas")
+        lines.append(f"  0. {marks['todas' in subscriptions]} {emoji_get('todas', '📌')} Todas")
 
-    # Exibe outras categorias começando do 1
+    # Exibe outras categorias começando do 1 (nome com primeira letra maiúscula)
     for idx, cat in enumerate(sorted_categories, 1):
-        # Busca emoji específico ou usa um padrão
-        emoji = CATEGORY_EMOJIS.get(cat, '📌')
-
-        # Formata o nome da categoria (primeira letra maiúscula)
-        cat_display = cat.capitalize()
-
-        # Status de inscrição
-        if cat in subscriptions:
-            status = "[green]✓[/green]" if RICH_AVAILABLE else "✓"
-        else:
-            status = "[dim]○[/dim]" if RICH_AVAILABLE else "○"
+        lines.append(f"  {idx}. {marks[cat in subscriptions]} {emoji_get(cat, '📌')} {cat.capitalize()}")
 
+    if lines:
         if RICH_AVAILABLE:
-            console.print(f"  {idx}. {status} {emoji} {cat_display}")
+            console.print("\n".join(lines))
         else:
-            print(f"  {idx}. {status} {emoji} {cat_display}")
+            print("\n".join(lines))
 
     if subscriptions:
         if RICH_AVAILABLE:
-            console.print(f"\n[green]✓[/green] Você está inscrito em: [bold]{', '.join(sorted(subscriptions))}[/bold]")
+            console.print(f"\n[green]✓[/green] Você está inscrito em: [bold]{_subs_str(subscriptions)}[/bold]")
         else:
-            print(f"\n✓ Você está inscrito em: {', '.join(sorted(subscriptions))}")
+            print(f"\n✓ Você está inscrito em: {_subs_str(subscriptions)}")
 
 
-def show_contextual_help(subscriptions: set):
-    """
-    Mostra ajuda contextual baseada no estado do usuário.
-
-    Args:
-        subscriptions: Set de categorias inscritas
-    """
-    if not subscriptions:
-        help_text = """
+# Textos da ajuda contextual; só a linha de assinaturas muda entre chamadas
+_HELP_TEXT_EMPTY = """
 [bold cyan]Comandos Disponíveis:[/bold cyan]
 
   [bold]INSCREVER[/bold] <categoria>     - Inscreve em uma ou mais categorias
@@ -347,8 +460,8 @@ def show_contextual_help(subscriptions: set):
 [yellow]💡 Dica:[/yellow] Você ainda não está inscrito em nenhuma categoria.
     Comece com: [bold]INSCREVER tecnologia[/bold]
 """
-    else:
-        help_text = f"""
+
+_HELP_TEXT_SUBSCRIBED = """
 [bold cyan]Comandos Disponíveis:[/bold cyan]
 
   [bold]INSCREVER[/bold] <categoria>     - Adicionar mais categorias
@@ -360,23 +473,47 @@ def show_contextual_help(subscriptions: set):
   [bold]HELP[/bold]                      - Mostra esta ajuda
   [bold]SAIR[/bold]                      - Desconectar
 
-[green]✓[/green] Suas assinaturas: [bold]{', '.join(sorted(subscriptions))}[/bold]
+[green]✓[/green] Suas assinaturas: [bold]{subscriptions}[/bold]
 
 [yellow]💡 Dica:[/yellow] Use [bold]HISTORICO[/bold] para ver notícias anteriores
 """
 
+_HELP_PLAIN = (
+    "\n" + _SEPARATOR + "\n"
+    "COMANDOS DISPONÍVEIS\n" +
+    _SEPARATOR + "\n"
+    "\nINSCREVER <categoria> - Inscreve em categoria\n"
+    "REMOVER <categoria>   - Remove inscrição\n"
+    "LISTAR                - Lista categorias\n"
+    "HISTORICO [cat] [N]   - Ver histórico\n"
+    "HELP                  - Ajuda\n"
+    "SAIR                  - Sair\n"
+)
+
+# Painel sem assinaturas é sempre igual: montado no primeiro uso
+_help_panel_empty = None
+
+
+def show_contextual_help(subscriptions: set):
+    """
+    Mostra ajuda contextual baseada no estado do usuário.
+
+    Args:
+        subscriptions: Set de categorias inscritas
+    """
     if RICH_AVAILABLE:
-        console.print(Panel(help_text, title="[bold]Ajuda[/bold]", border_style="cyan"))
+        global _help_panel_empty
+        _load_rich()
+        if not subscriptions:
+            if _help_panel_empty is None:
+                _help_panel_empty = Panel(_HELP_TEXT_EMPTY, title="[bold]Ajuda[/bold]", border_style="cyan")
+            console.print(_help_panel_empty)
+        else:
+            help_text = _HELP_TEXT_SUBSCRIBED.format(subscriptions=_subs_str(subscriptions))
+            console.print(Panel(help_text, title="[bold]Ajuda[/bold]", border_style="cyan"))
     else:
-        print("\n" + "="*60)
-        print("COMANDOS DISPONÍVEIS")
-        print("="*60)
-        print("\nINSCREVER <categoria> - Inscreve em categoria")
-        print("REMOVER <categoria>   - Remove inscrição")
-        print("LISTAR                - Lista categorias")
-        print("HISTORICO [cat] [N]   - Ver histórico")
-        print("HELP                  - Ajuda")
-        print("SAIR                  - Sair")
+        lines = [_HELP_PLAIN]
         if subscriptions:
-            print(f"\nSuas assinaturas: {', '.join(sorted(subscriptions))}")
-        print("="*60 + "\n")
+            lines.append(f"\nSuas assinaturas: {_subs_str(subscriptions)}\n")
+        lines.append(_SEPARATOR + "\n\n")
+        print("".join(lines), end="")
@@ -4,32 +4,193 @@ Responsável por persistir e recuperar notícias do sistema.
 """
 
 import json
+import mmap
 import os
+import time
 from datetime import datetime
 from typing import List, Dict, Any
-from threading import Lock
+from threading import Condition, Lock
+
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
 
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from common.config import NEWS_STORAGE_FILE, MAX_NEWS_HISTORY
 
+# orjson é opcional: serializa e lê o histórico em C, direto de/para bytes
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    _DUMP_OPTIONS = orjson.OPT_APPEND_NEWLINE
+    _loads = orjson.loads
+
+    def _dump_line(obj) -> bytes:
+        return orjson.dumps(obj, option=_DUMP_OPTIONS)
+else:
+    _loads = json.loads
+
+    def _dump_line(obj) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False) + '\n').encode('utf-8')
+
+# Notícia em memória: tupla com campos nomeados, bem menor que um dict por
+# notícia. O horário fica em nanossegundos desde a época (time.time_ns) e só
+# vira texto ISO quando a notícia sai do armazenamento
+NewsRow = namedtuple('NewsRow', 'id title lead category ts_ns')
+
+
+@lru_cache(maxsize=2 * MAX_NEWS_HISTORY)
+def _iso(ts_ns: int) -> str:
+    """Formata um horário em nanossegundos como datetime.isoformat() local"""
+    seconds, ns = divmod(ts_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=ns // 1000).isoformat()
+
+
+@lru_cache(maxsize=64)
+def _norm_category(category: str) -> str:
+    """Nome da categoria em minúsculas e internado (em cache por nome)"""
+    return sys.intern(category.lower())
+
+
+def _to_row(news: Dict[str, Any]) -> NewsRow:
+    """
+    Converte uma notícia lida do arquivo (dict) para NewsRow.
+
+    Registros antigos guardam "timestamp" em texto ISO no lugar de "ts_ns".
+    """
+    ts_ns = news.get("ts_ns")
+    if ts_ns is None:
+        moment = datetime.fromisoformat(news["timestamp"])
+        ts_ns = int(moment.timestamp()) * 1_000_000_000 + moment.microsecond * 1000
+    return NewsRow(news["id"], news["title"], news["lead"], sys.intern(news["category"]), ts_ns)
+
+
+def _to_dict(row: NewsRow) -> Dict[str, Any]:
+    """Converte uma NewsRow para o formato enviado aos clientes"""
+    return {
+        "id": row.id,
+        "title": row.title,
+        "lead": row.lead,
+        "category": row.category,
+        "timestamp": _iso(row.ts_ns)
+    }
+
+
+class _RWLock:
+    """
+    Lock de leitura e escrita: várias leituras ao mesmo tempo, escrita
+    exclusiva. Dá preferência à escrita: novas leituras esperam enquanto
+    houver uma escrita aguardando.
+    """
+
+    def __init__(self):
+        self._cond = Condition(Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        """Trecho de leitura (compartilhado)"""
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        """Trecho de escrita (exclusivo)"""
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
 
 class NewsStorage:
-    """Gerencia o armazenamento de notícias em memória e arquivo"""
+    """
+    Gerencia o armazenamento de notícias em memória e arquivo.
+
+    O arquivo é um log JSON Lines (uma notícia por linha): cada publicação
+    só acrescenta uma linha. Ele é regravado por inteiro apenas ao remover
+    notícias, ao limpar o histórico ou quando passa do dobro de
+    MAX_NEWS_HISTORY linhas.
+
+    O arquivo só é lido no primeiro acesso (ou por load()), para que criar
+    o armazenamento não dependa do tamanho do histórico.
+    """
 
     def __init__(self, storage_file: str = NEWS_STORAGE_FILE):
         self.storage_file = storage_file
-        self.news_list: List[Dict[str, Any]] = []
-        self.lock = Lock()
-        self._load_from_file()
+        self.news_list: List[NewsRow] = []
+        # Índice categoria -> notícias (as mesmas instâncias de news_list, em ordem)
+        self._by_cat: Dict[str, List[NewsRow]] = defaultdict(list)
+        self.lock = _RWLock()
+        self._file = None
+        self._file_lines = 0  # Linhas no arquivo, inclusive as já fora do histórico
+        self._next_id = 1
+        self._loaded = False
+
+    def load(self):
+        """Carrega o histórico do arquivo, se ainda não foi carregado"""
+        if self._loaded:
+            return
+        with self.lock.write():
+            if not self._loaded:
+                self._load_from_file()
+                self._loaded = True
 
     def _load_from_file(self):
-        """Carrega notícias do arquivo JSON se existir"""
-        if os.path.exists(self.storage_file):
+        """
+        Carrega notícias do arquivo se existir.
+
+        Também aceita o formato antigo (uma lista JSON, em news.json); nesse
+        caso, e se a última linha estiver incompleta, o arquivo é regravado.
+        """
+        path = self.storage_file
+        if not os.path.exists(path):
+            path = os.path.splitext(self.storage_file)[0] + '.json'
+
+        rewrite = False
+        if os.path.exists(path):
             try:
-                with open(self.storage_file, 'r', encoding='utf-8') as f:
-                    self.news_list = json.load(f)
+                with open(path, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        news_list = []
+                    else:
+                        # Lê direto das páginas mapeadas, sem copiar o arquivo
+                        # inteiro para uma string antes do parse
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                                mm.madvise(mmap.MADV_SEQUENTIAL)
+                            if mm[:64].lstrip()[:1] == b'[':
+                                news_list = [_to_row(n) for n in _loads(mm[:])]
+                                rewrite = True
+                            else:
+                                news_list = self._parse_lines(iter(mm.readline, b''))
+                                self._file_lines = len(news_list)
+                                rewrite = mm[-1:] != b'\n'
+                self.news_list = news_list[-MAX_NEWS_HISTORY:]
                 print(f"[Storage] {len(self.news_list)} notícias carregadas do arquivo")
             except Exception as e:
                 print(f"[Storage] Erro ao carregar arquivo: {e}")
@@ -38,13 +199,85 @@ class NewsStorage:
             # Cria diretório se não existir
             os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
 
+        self._rebuild_index()
+        # IDs continuam a partir do maior já usado, mesmo após remoções
+        self._next_id = max((row.id for row in self.news_list), default=0) + 1
+
+        if rewrite:
+            self._save_to_file()
+        else:
+            self._reopen()
+
+    def _rebuild_index(self):
+        """Reconstrói o índice por categoria a partir de news_list"""
+        self._by_cat = defaultdict(list)
+        for row in self.news_list:
+            self._by_cat[row.category].append(row)
+
+    @staticmethod
+    def _parse_lines(lines) -> List[NewsRow]:
+        """Lê as notícias das linhas de um log JSON Lines, ignorando as inválidas"""
+        news_list = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                news_list.append(_to_row(_loads(line)))
+            except (ValueError, KeyError, TypeError):
+                # Linha cortada por uma queda durante a escrita
+                continue
+        return news_list
+
+    def _reopen(self):
+        """(Re)abre o arquivo para acrescentar notícias no final"""
+        if self._file:
+            self._file.close()
+        try:
+            self._file = open(self.storage_file, 'ab')
+        except Exception as e:
+            self._file = None
+            print(f"[Storage] Erro ao abrir arquivo: {e}")
+
+    def _append_to_file(self, row: NewsRow):
+        """Acrescenta uma notícia ao final do arquivo"""
+        if self._file is None:
+            return
+        try:
+            self._file.write(_dump_line(row._asdict()))
+            self._file.flush()
+            self._file_lines += 1
+        except Exception as e:
+            print(f"[Storage] Erro ao salvar arquivo: {e}")
+            return
+
+        # Descarta do arquivo as notícias que já saíram do histórico
+        if self._file_lines > 2 * MAX_NEWS_HISTORY:
+            self._save_to_file()
+
     def _save_to_file(self):
-        """Salva notícias no arquivo JSON"""
+        """
+        Regrava o arquivo apenas com as notícias em memória.
+
+        Escreve num arquivo temporário e o troca pelo definitivo com
+        os.replace (atômico), para que uma queda no meio da escrita não
+        deixe o histórico truncado.
+        """
+        tmp_file = self.storage_file + '.tmp'
         try:
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(self.news_list, f, ensure_ascii=False, indent=2)
+            with open(tmp_file, 'wb') as f:
+                f.write(b''.join([_dump_line(row._asdict()) for row in self.news_list]))
+            os.replace(tmp_file, self.storage_file)
+            self._file_lines = len(self.news_list)
         except Exception as e:
             print(f"[Storage] Erro ao salvar arquivo: {e}")
+        self._reopen()
+
+    def close(self):
+        """Fecha o arquivo do histórico"""
+        with self.lock.write():
+            if self._file:
+                self._file.close()
+                self._file = None
 
     def add_news(self, title: str, lead: str, category: str) -> Dict[str, Any]:
         """
@@ -58,23 +291,29 @@ class NewsStorage:
         Returns:
             Dicionário com os dados da notícia adicionada
         """
-        with self.lock:
-            news = {
-                "id": len(self.news_list) + 1,
-                "title": title,
-                "lead": lead,
-                "category": category.lower(),
-                "timestamp": datetime.now().isoformat()
-            }
-
-            self.news_list.append(news)
-
-            # Limita o tamanho do histórico
+        self.load()
+        with self.lock.write():
+            row = NewsRow(
+                self._next_id,
+                title,
+                lead,
+                _norm_category(category),
+                time.time_ns()
+            )
+
+            self._next_id += 1
+            self.news_list.append(row)
+            self._by_cat[row.category].append(row)
+
+            # Limita o tamanho do histórico; as mais antigas saem também do
+            # início da lista da sua categoria
             if len(self.news_list) > MAX_NEWS_HISTORY:
+                for old in self.news_list[:-MAX_NEWS_HISTORY]:
+                    self._by_cat[old.category].pop(0)
                 self.news_list = self.news_list[-MAX_NEWS_HISTORY:]
 
-            self._save_to_file()
-            return news
+            self._append_to_file(row)
+            return _to_dict(row)
 
     def get_news_by_category(self, category: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -87,9 +326,10 @@ class NewsStorage:
         Returns:
             Lista de notícias da categoria
         """
-        with self.lock:
-            filtered = [n for n in self.news_list if n["category"] == category.lower()]
-            return filtered[-limit:]
+        self.load()
+        with self.lock.read():
+            rows = self._by_cat.get(_norm_category(category), [])[-limit:]
+        return [_to_dict(row) for row in rows]
 
     def get_all_news(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
@@ -101,18 +341,24 @@ class NewsStorage:
         Returns:
             Lista de notícias
         """
-        with self.lock:
-            return self.news_list[-limit:]
+        self.load()
+        with self.lock.read():
+            rows = self.news_list[-limit:]
+        return [_to_dict(row) for row in rows]
 
     def get_news_count(self) -> int:
         """Retorna o número total de notícias armazenadas"""
-        with self.lock:
+        self.load()
+        with self.lock.read():
             return len(self.news_list)
 
     def clear_history(self):
         """Limpa todo o histórico de notícias"""
-        with self.lock:
+        self.load()
+        with self.lock.write():
             self.news_list = []
+            self._by_cat = defaultdict(list)
+            self._next_id = 1
             self._save_to_file()
             print("[Storage] Histórico de notícias limpo")
 
@@ -126,27 +372,19 @@ class NewsStorage:
         Returns:
             Tupla com (quantidade removida, IDs não encontrados)
         """
-        with self.lock:
-            initial_count = len(self.news_list)
-            not_found = []
-
-            # Filtra as notícias que NÃO devem ser removidas
-            self.news_list = [n for n in self.news_list if n["id"] not in news_ids]
-
-            # Verifica quais IDs não foram encontrados
-            removed_ids = set()
-            for news in self.news_list:
-                if news["id"] in news_ids:
-                    removed_ids.add(news["id"])
-
-            for news_id in news_ids:
-                if news_id not in removed_ids:
-                    # Verifica se o ID realmente não existia
-                    not_found.append(news_id)
+        self.load()
+        with self.lock.write():
+            wanted = frozenset(news_ids)
+            existing_ids = {row.id for row in self.news_list}
+            not_found = [news_id for news_id in news_ids if news_id not in existing_ids]
 
-            removed_count = initial_count - len(self.news_list)
+            # Mantém só as notícias que NÃO devem ser removidas
+            kept = [row for row in self.news_list if row.id not in wanted]
+            removed_count = len(self.news_list) - len(kept)
+            self.news_list = kept
 
             if removed_count > 0:
+                self._rebuild_index()
                 self._save_to_file()
                 print(f"[Storage] {removed_count} notícia(s) removida(s)")
 
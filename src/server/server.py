@@ -4,7 +4,11 @@ Gerencia múltiplas conexões de clientes e distribui notícias conforme assinat
 """
 
 import socket
+import struct
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, Set
 import sys
 import os
@@ -12,14 +16,188 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from common.protocol import Message, MessageType
-from common.config import DEFAULT_HOST, DEFAULT_PORT, BUFFER_SIZE, ENCODING, DEFAULT_CATEGORIES
+from common.transport import send_buffers
+from common.config import (
+    DEFAULT_HOST, DEFAULT_PORT, BUFFER_SIZE, SOCKET_BUFFER_SIZE, TCP_USER_TIMEOUT_MS,
+    CLIENT_SEND_TIMEOUT, ENCODING, DEFAULT_CATEGORIES
+)
 from server.subscription_manager import SubscriptionManager
 from server.news_storage import NewsStorage
 
+# Sem SIGPIPE ao escrever num socket já fechado pelo cliente (Linux); a
+# falha vira um OSError tratado no envio
+_SEND_FLAGS = getattr(socket, "MSG_NOSIGNAL", 0)
+
+# SO_SNDTIMEO (struct timeval): um envio parado além disso falha com EAGAIN
+_SEND_TIMEOUT = struct.pack("ll", CLIENT_SEND_TIMEOUT, 0)
+
+# Respostas fixas, serializadas e codificadas uma única vez
+_WELCOME_BYTES = Message.success("Conectado ao servidor de notícias!").encode(ENCODING)
+_HISTORY_CLEARED_BYTES = Message.success("Histórico de notícias limpo com sucesso").encode(ENCODING)
+_NO_NEWS_IDS_BYTES = Message.error("Nenhum ID de notícia fornecido").encode(ENCODING)
+_DISCONNECTED_BYTES = Message.success("Desconectado com sucesso").encode(ENCODING)
+
+
+@lru_cache(maxsize=64)
+def _invalid_category_error(category: str) -> bytes:
+    """Resposta de erro para uma categoria inválida (em cache por categoria)"""
+    return Message.error(f"Categoria '{category}' inválida").encode(ENCODING)
+
+
+def _shutdown(sock: socket.socket):
+    """
+    Encerra a conexão nos dois sentidos sem fechar o socket.
+
+    O que já foi entregue ao kernel ainda é enviado antes do FIN, e a
+    thread que lê o socket recebe EOF e faz a limpeza normal.
+    """
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+class _ClientOutbox:
+    """
+    Fila de saída de um cliente.
+
+    A thread que encontra a fila ociosa passa a esvaziá-la e envia, numa
+    única chamada, tudo o que estiver pendente, inclusive o que outras
+    threads enfileirarem enquanto ela envia. As mensagens de um cliente
+    nunca se intercalam, e rajadas de notícias saem juntas. Se o cliente
+    não consome, as notícias mais antigas são descartadas além do limite;
+    respostas aos pedidos do próprio cliente nunca são descartadas.
+    """
+
+    def __init__(self, sock: socket.socket, limit: int):
+        self.sock = sock
+        # Itens (mensagem, é notícia), na ordem de envio
+        self.pending = deque()
+        self.limit = limit
+        self.news_count = 0  # Notícias em pending
+        self.lock = threading.Lock()
+        self.flushing = False
+        self.closed = False
+        self.closing = False  # Encerrar a conexão quando a fila esvaziar
+
+    def push(self, data: bytes, news: bool = False) -> bool:
+        """
+        Enfileira uma mensagem.
+
+        Args:
+            data: Mensagem em bytes
+            news: True para notícias distribuídas (descartáveis além do
+                limite); respostas diretas usam False
+
+        Returns:
+            True se quem chamou deve esvaziar a fila com flush(); False se
+            outra thread já está enviando (a mensagem sai junto) ou se o
+            cliente já desconectou
+        """
+        with self.lock:
+            if self.closed or self.closing:
+                return False
+            pending = self.pending
+            pending.append((data, news))
+            if news:
+                self.news_count += 1
+                if self.news_count > self.limit:
+                    self._drop_oldest_news()
+            if self.flushing:
+                return False
+            self.flushing = True
+            return True
+
+    def _drop_oldest_news(self):
+        """Descarta a notícia mais antiga da fila (chamar com o lock)"""
+        # Com a fila cheia de notícias, a primeira costuma estar no início:
+        # só as respostas à frente dela são percorridas
+        for i, (_, news) in enumerate(self.pending):
+            if news:
+                del self.pending[i]
+                self.news_count -= 1
+                return
+
+    def flush(self) -> bool:
+        """
+        Envia tudo o que estiver pendente, até a fila esvaziar.
+
+        Returns:
+            False se o cliente desconectou
+        """
+        try:
+            while True:
+                with self.lock:
+                    if not self.pending:
+                        self.flushing = False
+                        closing = self.closing
+                        break
+                    buffers = [data for data, _ in self.pending]
+                    self.pending.clear()
+                    self.news_count = 0
+                send_buffers(self.sock, buffers, _SEND_FLAGS)
+        except OSError:
+            # Cliente desconectou (BrokenPipe, ConnectionReset...) ou parou de
+            # ler por mais de CLIENT_SEND_TIMEOUT (EAGAIN): a conexão é
+            # encerrada, e o laço de leitura dele faz a limpeza
+            with self.lock:
+                self.closed = True
+                self.flushing = False
+                self.pending.clear()
+                self.news_count = 0
+            _shutdown(self.sock)
+            return False
+
+        if closing:
+            _shutdown(self.sock)
+        return True
+
+    def send_last(self, data: bytes) -> bool:
+        """
+        Enfileira a última mensagem e encerra a conexão depois de enviá-la.
+
+        Quem estiver esvaziando a fila (esta thread ou uma do pool) encerra
+        a conexão ao terminar; mensagens enfileiradas depois são recusadas.
+
+        Args:
+            data: Mensagem em bytes
+
+        Returns:
+            False se o cliente já tinha desconectado
+        """
+        with self.lock:
+            if self.closed or self.closing:
+                return False
+            self.pending.append((data, False))
+            self.closing = True
+            if self.flushing:
+                return True
+            self.flushing = True
+        return self.flush()
+
+    def send(self, data: bytes) -> bool:
+        """
+        Enfileira uma mensagem e, se ninguém estiver enviando, envia a fila.
+
+        Args:
+            data: Mensagem em bytes
+
+        Returns:
+            False se o cliente desconectou
+        """
+        if self.push(data):
+            return self.flush()
+        return not self.closed
+
 
 class NewsServer:
     """Servidor de notícias usando modelo PUB/SUB com TCP"""
 
+    # Threads que enviam uma notícia aos inscritos em paralelo
+    FANOUT_WORKERS = 32
+    # Notícias pendentes por cliente antes de descartar as mais antigas
+    OUTBOX_LIMIT = 1024
+
     def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
         self.host = host
         self.port = port
@@ -30,9 +208,40 @@ class NewsServer:
         self.subscription_manager = SubscriptionManager(DEFAULT_CATEGORIES)
         self.news_storage = NewsStorage()
 
+        # Lista de categorias não muda: resposta de LISTAR pronta em bytes
+        categories = self.subscription_manager.get_available_categories()
+        self._categories_bytes = Message.categories_list(categories).encode(ENCODING)
+
+        # Nome canônico (internado) de cada categoria. Nomes já em minúsculas,
+        # como os enviados pelos clientes, resolvem sem chamar lower()
+        self._categories: Dict[str, str] = {}
+        for cat in categories:
+            cat = sys.intern(cat)
+            self._categories[cat] = cat
+
         # Clientes conectados
         self.clients: Set[socket.socket] = set()
         self.clients_lock = threading.Lock()
+        # Fila de saída de cada cliente conectado
+        self._outboxes: Dict[socket.socket, _ClientOutbox] = {}
+
+        # Tipo de mensagem -> método que a trata
+        self._handlers = {
+            MessageType.SUBSCRIBE: self._on_subscribe,
+            MessageType.UNSUBSCRIBE: self._on_unsubscribe,
+            MessageType.LIST_CATEGORIES: self._on_list,
+            MessageType.HISTORY: self._on_history,
+            MessageType.CLEAR_HISTORY: self._on_clear,
+            MessageType.REMOVE_NEWS: self._on_remove,
+            MessageType.PUBLISH: self._on_publish,
+            MessageType.DISCONNECT: self._on_disconnect,
+        }
+
+        # Envio das notícias: um cliente lento não atrasa os demais
+        self._fanout_pool = ThreadPoolExecutor(
+            max_workers=self.FANOUT_WORKERS,
+            thread_name_prefix="news-fanout"
+        )
 
         # Estatísticas
         self.total_clients_served = 0
@@ -44,14 +253,21 @@ class NewsServer:
             self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.server_socket.bind((self.host, self.port))
-            self.server_socket.listen(5)
+            # Fila de conexões pendentes do tamanho máximo do sistema: com 5,
+            # uma leva de clientes conectando ao mesmo tempo era recusada
+            self.server_socket.listen(socket.SOMAXCONN)
             self.running = True
 
             print(f"[Servidor] Iniciado em {self.host}:{self.port}")
             print(f"[Servidor] Categorias disponíveis: {', '.join(DEFAULT_CATEGORIES)}")
-            print(f"[Servidor] {self.news_storage.get_news_count()} notícias no histórico")
             print("[Servidor] Aguardando conexões...\n")
 
+            # Histórico carregado em segundo plano: conexões já são aceitas
+            # enquanto isso, e só o que consulta o histórico espera por ele
+            history_thread = threading.Thread(target=self._load_history, name="news-history-load")
+            history_thread.daemon = True
+            history_thread.start()
+
             # Thread para aceitar conexões
             accept_thread = threading.Thread(target=self._accept_connections)
             accept_thread.daemon = True
@@ -67,6 +283,11 @@ class NewsServer:
             print(f"[Servidor] Erro: {e}")
             self.stop()
 
+    def _load_history(self):
+        """Carrega o histórico de notícias (executa numa thread própria)"""
+        self.news_storage.load()
+        print(f"[Servidor] {self.news_storage.get_news_count()} notícias no histórico")
+
     def stop(self):
         """Para o servidor e desconecta todos os clientes"""
         self.running = False
@@ -78,10 +299,14 @@ class NewsServer:
                 except:
                     pass
             self.clients.clear()
+            self._outboxes.clear()
 
         if self.server_socket:
             self.server_socket.close()
 
+        self._fanout_pool.shutdown(wait=False)
+        self.news_storage.close()
+
         print("[Servidor] Servidor encerrado")
 
     def _accept_connections(self):
@@ -89,11 +314,14 @@ class NewsServer:
         while self.running:
             try:
                 client_socket, address = self.server_socket.accept()
+                self._configure_client_socket(client_socket)
                 print(f"[Servidor] Nova conexão de {address}")
 
                 with self.clients_lock:
                     self.clients.add(client_socket)
+                    self._outboxes[client_socket] = _ClientOutbox(client_socket, self.OUTBOX_LIMIT)
                     self.total_clients_served += 1
+                self.subscription_manager.register(client_socket)
 
                 # Cria thread para gerenciar este cliente
                 client_thread = threading.Thread(
@@ -107,6 +335,32 @@ class NewsServer:
                 if self.running:
                     print(f"[Servidor] Erro ao aceitar conexão: {e}")
 
+    @staticmethod
+    def _configure_client_socket(client_socket: socket.socket):
+        """
+        Ajusta as opções de um socket de cliente recém-aceito.
+
+        Notícias são mensagens pequenas e sensíveis a atraso: desativa o
+        algoritmo de Nagle e aumenta o buffer de envio para que uma rajada
+        caiba no kernel. Keepalive e TCP_USER_TIMEOUT (Linux) fazem o kernel
+        derrubar clientes mortos. Um cliente que continua confirmando com
+        janela zero, mas não lê, não é pego por eles: SO_SNDTIMEO faz o envio
+        parado falhar, e a conexão é encerrada em vez de prender uma thread
+        do pool de distribuição.
+
+        Args:
+            client_socket: Socket do cliente
+        """
+        try:
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+            if hasattr(socket, "TCP_USER_TIMEOUT"):
+                client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT, TCP_USER_TIMEOUT_MS)
+            client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDTIMEO, _SEND_TIMEOUT)
+        except OSError:
+            pass
+
     def _handle_client(self, client_socket: socket.socket, address: tuple):
         """
         Gerencia a comunicação com um cliente específico.
@@ -119,23 +373,30 @@ class NewsServer:
 
         try:
             # Envia mensagem de boas-vindas
-            welcome_msg = Message.success("Conectado ao servidor de notícias!")
-            self._send_to_client(client_socket, welcome_msg)
+            self._send_bytes(client_socket, _WELCOME_BYTES)
 
-            # Buffer para mensagens incompletas
-            buffer = ""
+            # Buffer de bytes para mensagens incompletas. recv_into escreve
+            # sempre no mesmo bloco, e as linhas completas vão em bytes para
+            # o parse (um caractere UTF-8 pode chegar dividido entre dois recv)
+            buffer = bytearray()
+            chunk = bytearray(BUFFER_SIZE)
+            view = memoryview(chunk)
 
             while self.running:
-                data = client_socket.recv(BUFFER_SIZE).decode(ENCODING)
+                received = client_socket.recv_into(chunk)
 
-                if not data:
+                if not received:
                     break
 
-                buffer += data
-                messages = buffer.split('\n')
-                buffer = messages[-1]  # Última mensagem pode estar incompleta
+                buffer += view[:received]
+                end = buffer.rfind(b'\n')
+                if end < 0:
+                    continue  # Nenhuma mensagem completa ainda
+
+                messages = buffer[:end].split(b'\n')
+                del buffer[:end + 1]  # Mantém só a última mensagem incompleta
 
-                for raw_msg in messages[:-1]:
+                for raw_msg in messages:
                     if raw_msg.strip():
                         self._process_message(client_socket, client_id, raw_msg)
 
@@ -146,131 +407,174 @@ class NewsServer:
         finally:
             self._disconnect_client(client_socket, client_id)
 
-    def _process_message(self, client_socket: socket.socket, client_id: str, raw_message: str):
+    def _process_message(self, client_socket: socket.socket, client_id: str, raw_message: bytes):
         """
         Processa uma mensagem recebida de um cliente.
 
         Args:
             client_socket: Socket do cliente
             client_id: ID do cliente
-            raw_message: Mensagem bruta recebida
+            raw_message: Mensagem bruta recebida (uma linha, em bytes)
         """
         msg = Message.parse(raw_message)
         msg_type = msg.get("type")
-        data = msg.get("data", {})
 
-        if msg_type == MessageType.SUBSCRIBE:
-            category = data.get("category", "").lower()
-            success, message = self.subscription_manager.subscribe(client_socket, category)
+        handler = self._handlers.get(msg_type)
+        if handler is not None:
+            handler(client_socket, client_id, msg.get("data", {}))
+        else:
+            response = Message.error(f"Comando '{msg_type}' não reconhecido")
+            self._send_to_client(client_socket, response)
+
+    def _on_subscribe(self, client_socket: socket.socket, client_id: str, data: dict):
+        """Inscreve o cliente nas categorias pedidas"""
+        # Uma resposta por categoria, enviadas juntas num único envio
+        categories = self._requested_categories(data)
+        results = self.subscription_manager.subscribe_many(client_socket, categories)
+        responses = []
+        for category, (success, message) in zip(categories, results):
             print(f"[Cliente {client_id}] INSCREVER {category}: {message}")
 
             if success:
-                response = Message.success(message)
+                responses.append(Message.success(message))
             else:
-                response = Message.error(message)
+                responses.append(Message.error(message))
 
-            self._send_to_client(client_socket, response)
+        self._send_to_client(client_socket, "".join(responses))
 
-        elif msg_type == MessageType.UNSUBSCRIBE:
-            category = data.get("category", "").lower()
-            success, message = self.subscription_manager.unsubscribe(client_socket, category)
+    def _on_unsubscribe(self, client_socket: socket.socket, client_id: str, data: dict):
+        """Remove as inscrições do cliente nas categorias pedidas"""
+        categories = self._requested_categories(data)
+        results = self.subscription_manager.unsubscribe_many(client_socket, categories)
+        responses = []
+        for category, (success, message) in zip(categories, results):
             print(f"[Cliente {client_id}] REMOVER {category}: {message}")
 
             if success:
-                response = Message.success(message)
+                responses.append(Message.success(message))
             else:
-                response = Message.error(message)
+                responses.append(Message.error(message))
 
-            self._send_to_client(client_socket, response)
+        self._send_to_client(client_socket, "".join(responses))
 
-        elif msg_type == MessageType.LIST_CATEGORIES:
-            categories = self.subscription_manager.get_available_categories()
+    def _on_list(self, client_socket: socket.socket, client_id: str, data: dict):
+        """Envia a lista de categorias"""
+        self._send_bytes(client_socket, self._categories_bytes)
 
-            response = Message.categories_list(categories)
-            self._send_to_client(client_socket, response)
+    def _on_history(self, client_socket: socket.socket, client_id: str, data: dict):
+        """Envia o histórico de notícias (geral ou de uma categoria)"""
+        category = data.get("category")
+        limit = data.get("limit", 10)
 
-        elif msg_type == MessageType.HISTORY:
-            # Cliente solicitou histórico de notícias
-            category = data.get("category")
-            limit = data.get("limit", 10)
-
-            if category:
-                # Histórico de uma categoria específica
-                if category in self.subscription_manager.get_available_categories():
-                    news_list = self.news_storage.get_news_by_category(category, limit)
-                    print(f"[Cliente {client_id}] HISTÓRICO {category}: {len(news_list)} notícias")
-                else:
-                    response = Message.error(f"Categoria '{category}' inválida")
-                    self._send_to_client(client_socket, response)
-                    return
+        if category:
+            # Histórico de uma categoria específica
+            category = self._resolve_category(category)
+            if category in self._categories:
+                news_list = self.news_storage.get_news_by_category(category, limit)
+                print(f"[Cliente {client_id}] HISTÓRICO {category}: {len(news_list)} notícias")
             else:
-                # Histórico geral
-                news_list = self.news_storage.get_all_news(limit)
-                print(f"[Cliente {client_id}] HISTÓRICO geral: {len(news_list)} notícias")
-
-            response = Message.news_history(news_list)
-            self._send_to_client(client_socket, response)
+                self._send_bytes(client_socket, _invalid_category_error(category))
+                return
+        else:
+            # Histórico geral
+            news_list = self.news_storage.get_all_news(limit)
+            print(f"[Cliente {client_id}] HISTÓRICO geral: {len(news_list)} notícias")
 
-        elif msg_type == MessageType.CLEAR_HISTORY:
-            # Editor solicitou limpeza do histórico
-            self.news_storage.clear_history()
-            print(f"[Editor {client_id}] Histórico de notícias limpo")
-            response = Message.success("Histórico de notícias limpo com sucesso")
-            self._send_to_client(client_socket, response)
+        response = Message.news_history(news_list)
+        self._send_to_client(client_socket, response)
 
-        elif msg_type == MessageType.REMOVE_NEWS:
-            # Editor solicitou remoção de notícias específicas
-            news_ids = data.get("news_ids", [])
+    def _on_clear(self, client_socket: socket.socket, client_id: str, data: dict):
+        """Limpa o histórico de notícias (pedido de um editor)"""
+        self.news_storage.clear_history()
+        print(f"[Editor {client_id}] Histórico de notícias limpo")
+        self._send_bytes(client_socket, _HISTORY_CLEARED_BYTES)
 
-            if not news_ids:
-                response = Message.error("Nenhum ID de notícia fornecido")
-                self._send_to_client(client_socket, response)
-                return
+    def _on_remove(self, client_socket: socket.socket, client_id: str, data: dict):
+        """Remove notícias específicas pelo ID (pedido de um editor)"""
+        news_ids = data.get("news_ids", [])
 
-            removed_count, not_found = self.news_storage.remove_news_by_ids(news_ids)
+        if not news_ids:
+            self._send_bytes(client_socket, _NO_NEWS_IDS_BYTES)
+            return
 
-            print(f"[Editor {client_id}] Removeu {removed_count} notícia(s): IDs {news_ids}")
+        removed_count, not_found = self.news_storage.remove_news_by_ids(news_ids)
 
-            if removed_count > 0:
-                msg = f"{removed_count} notícia(s) removida(s) com sucesso"
-                if not_found:
-                    msg += f" (IDs não encontrados: {', '.join(map(str, not_found))})"
-                response = Message.success(msg)
-            else:
-                response = Message.error(f"Nenhuma notícia encontrada com os IDs: {', '.join(map(str, news_ids))}")
+        print(f"[Editor {client_id}] Removeu {removed_count} notícia(s): IDs {news_ids}")
 
-            self._send_to_client(client_socket, response)
+        if removed_count > 0:
+            msg = f"{removed_count} notícia(s) removida(s) com sucesso"
+            if not_found:
+                msg += f" (IDs não encontrados: {', '.join(map(str, not_found))})"
+            response = Message.success(msg)
+        else:
+            response = Message.error(f"Nenhuma notícia encontrada com os IDs: {', '.join(map(str, news_ids))}")
 
-        elif msg_type == MessageType.PUBLISH:
-            # Recebe notícia de um editor
-            title = data.get("title", "")
-            lead = data.get("lead", "")
-            category = data.get("category", "").lower()
+        self._send_to_client(client_socket, response)
 
-            if category in self.subscription_manager.get_available_categories():
-                # Armazena a notícia
-                news = self.news_storage.add_news(title, lead, category)
-                self.news_published += 1
+    def _on_publish(self, client_socket: socket.socket, client_id: str, data: dict):
+        """Armazena e distribui uma notícia recebida de um editor"""
+        title = data.get("title", "")
+        lead = data.get("lead", "")
+        category = self._resolve_category(data.get("category", ""))
 
-                print(f"[Editor {client_id}] Nova notícia publicada em '{category}': {title}")
+        if category in self._categories:
+            # Armazena a notícia
+            news = self.news_storage.add_news(title, lead, category)
+            self.news_published += 1
 
-                # Distribui para todos os inscritos
-                self._broadcast_news(title, lead, category)
+            print(f"[Editor {client_id}] Nova notícia publicada em '{category}': {title}")
 
-                response = Message.success(f"Notícia publicada com sucesso (ID: {news['id']})")
-            else:
-                response = Message.error(f"Categoria '{category}' inválida")
+            # Distribui para todos os inscritos
+            self._broadcast_news(title, lead, category)
 
+            response = Message.success(f"Notícia publicada com sucesso (ID: {news['id']})")
             self._send_to_client(client_socket, response)
+        else:
+            self._send_bytes(client_socket, _invalid_category_error(category))
+
+    def _on_disconnect(self, client_socket: socket.socket, client_id: str, data: dict):
+        """Confirma e encerra a conexão a pedido do cliente"""
+        print(f"[Cliente {client_id}] Solicitou desconexão")
+        # A confirmação sai pela fila do cliente, depois do que já estiver
+        # pendente; só então a conexão é encerrada, e o laço de leitura
+        # recebe EOF e faz a limpeza
+        outbox = self._outboxes.get(client_socket)
+        if outbox is None or not outbox.send_last(_DISCONNECTED_BYTES):
+            _shutdown(client_socket)
+
+    def _resolve_category(self, category: str) -> str:
+        """
+        Normaliza o nome de uma categoria recebida de um cliente.
 
-        elif msg_type == MessageType.DISCONNECT:
-            print(f"[Cliente {client_id}] Solicitou desconexão")
-            self._send_to_client(client_socket, Message.success("Desconectado com sucesso"))
-            client_socket.close()
+        Args:
+            category: Nome como veio na mensagem
 
-        else:
-            response = Message.error(f"Comando '{msg_type}' não reconhecido")
-            self._send_to_client(client_socket, response)
+        Returns:
+            Nome canônico da categoria (sempre o mesmo objeto), ou o nome em
+            minúsculas se a categoria não existir
+        """
+        canonical = self._categories.get(category)
+        if canonical is None:
+            canonical = str(category).lower()
+            canonical = self._categories.get(canonical, canonical)
+        return canonical
+
+    def _requested_categories(self, data: dict) -> list:
+        """
+        Extrai as categorias de uma mensagem de INSCREVER/REMOVER.
+
+        Aceita tanto "category" (uma categoria) quanto "categories" (lista).
+
+        Args:
+            data: Dados da mensagem
+
+        Returns:
+            Lista de categorias normalizadas (_resolve_category)
+        """
+        categories = data.get("categories")
+        if isinstance(categories, list):
+            return [self._resolve_category(cat) for cat in categories]
+        return [self._resolve_category(data.get("category", ""))]
 
     def _broadcast_news(self, title: str, lead: str, category: str):
         """
@@ -281,28 +585,52 @@ class NewsServer:
             lead: Lead da notícia
             category: Categoria da notícia
         """
-        subscribers = self.subscription_manager.get_subscribers(category)
-        news_msg = Message.news_update(title, lead, category)
+        # Codificada uma vez, o mesmo payload vai para todos os inscritos
+        payload = Message.news_update(title, lead, category).encode(ENCODING)
+
+        # As mensagens entram na fila de cada inscrito aqui, na ordem de
+        # publicação; o envio fica com as threads do pool, e um cliente
+        # lento não atrasa os demais nem a resposta ao editor. Os inscritos
+        # vêm de um retrato imutável, sem lock e sem cópia
+        outboxes = self._outboxes
+        count = 0
+        for client_socket in self.subscription_manager.iter_subscribers(category):
+            count += 1
+            outbox = outboxes.get(client_socket)
+            if outbox is not None and outbox.push(payload, news=True):
+                self._fanout_pool.submit(self._flush_outbox, outbox)
+
+        print(f"[Servidor] Notícia de '{category}' distribuída para {count} cliente(s)")
+
+    def _flush_outbox(self, outbox: _ClientOutbox):
+        """
+        Esvazia a fila de saída de um inscrito (executa no pool).
 
-        print(f"[Servidor] Distribuindo notícia de '{category}' para {len(subscribers)} cliente(s)")
+        Args:
+            outbox: Fila de saída do cliente
+        """
+        if not outbox.flush():
+            # Cliente desconectou: sai das assinaturas e da lista de clientes
+            self.subscription_manager.remove_client(outbox.sock)
+            with self.clients_lock:
+                self.clients.discard(outbox.sock)
+                self._outboxes.pop(outbox.sock, None)
 
-        # Envia para cada cliente, removendo os que falharam
-        failed_clients = []
-        for client_socket in subscribers:
-            try:
-                client_socket.sendall(news_msg.encode(ENCODING))
-            except (BrokenPipeError, ConnectionResetError, OSError):
-                # Cliente desconectou, marcar para remoção
-                failed_clients.append(client_socket)
-            except Exception as e:
-                print(f"[Servidor] Erro ao enviar para cliente: {e}")
-                failed_clients.append(client_socket)
+    def _try_send(self, client_socket: socket.socket, payload: bytes) -> bool:
+        """
+        Envia uma mensagem a um cliente pela fila de saída dele.
 
-        # Remove clientes que falharam
-        for client_socket in failed_clients:
-            self.subscription_manager.remove_client(client_socket)
-            with self.clients_lock:
-                self.clients.discard(client_socket)
+        Args:
+            client_socket: Socket do cliente
+            payload: Mensagem em bytes
+
+        Returns:
+            False se o cliente desconectou ou o envio falhou
+        """
+        outbox = self._outboxes.get(client_socket)
+        if outbox is None:
+            return False
+        return outbox.send(payload)
 
     def _send_to_client(self, client_socket: socket.socket, message: str):
         """
@@ -312,13 +640,19 @@ class NewsServer:
             client_socket: Socket do cliente
             message: Mensagem a enviar
         """
-        try:
-            client_socket.sendall(message.encode(ENCODING))
-        except (BrokenPipeError, ConnectionResetError, OSError) as e:
-            # Cliente desconectou - isso é normal, não precisa logar
-            pass
-        except Exception as e:
-            print(f"[Servidor] Erro inesperado ao enviar mensagem: {e}")
+        self._send_bytes(client_socket, message.encode(ENCODING))
+
+    def _send_bytes(self, client_socket: socket.socket, data: bytes):
+        """
+        Envia uma mensagem já codificada para um cliente específico.
+
+        Args:
+            client_socket: Socket do cliente
+            data: Mensagem em bytes
+        """
+        # Cliente desconectado é normal aqui: o laço de leitura dele encerra
+        # a conexão, não precisa logar
+        self._try_send(client_socket, data)
 
     def _disconnect_client(self, client_socket: socket.socket, client_id: str):
         """
@@ -328,16 +662,16 @@ class NewsServer:
             client_socket: Socket do cliente
             client_id: ID do cliente
         """
-        subscriptions = self.subscription_manager.get_client_subscriptions(client_socket)
+        # As assinaturas removidas vêm do mesmo retrato usado na remoção
+        subscriptions = self.subscription_manager.remove_client(client_socket)
         if subscriptions:
             print(f"[Cliente {client_id}] Desconectado (estava inscrito em: {', '.join(subscriptions)})")
         else:
             print(f"[Cliente {client_id}] Desconectado")
 
-        self.subscription_manager.remove_client(client_socket)
-
         with self.clients_lock:
             self.clients.discard(client_socket)
+            self._outboxes.pop(client_socket, None)
 
         try:
             client_socket.close()
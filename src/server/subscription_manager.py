@@ -3,23 +3,155 @@ Gerenciador de assinaturas de clientes.
 Mantém o registro de quais clientes estão inscritos em quais categorias.
 """
 
-from typing import Dict, Set, List
+from typing import Dict, List, FrozenSet, Iterator, Optional, Tuple
 from threading import Lock
+from contextlib import ExitStack
+import heapq
 import socket
+import sys
+
+_NO_SUBSCRIPTIONS = "Cliente não tem assinaturas"
+
+# Conjunto vazio compartilhado: consultas sem resultado não alocam nada
+_EMPTY: FrozenSet[str] = frozenset()
 
 
 class SubscriptionManager:
-    """Gerencia as assinaturas dos clientes por categoria"""
+    """
+    Gerencia as assinaturas dos clientes por categoria.
+
+    Cada cliente recebe um ID inteiro ao se registrar; as assinaturas
+    guardam só esses IDs, e o socket de cada um fica num único mapa.
+
+    Os inscritos de cada categoria formam um mapa de bits num int (bit N =
+    cliente de ID N). IDs liberados são reaproveitados, menor primeiro,
+    para que os mapas fiquem com o tamanho do número de clientes
+    conectados, e não do total já atendido; quem percorre um retrato
+    antigo confere a inscrição do dono atual do ID (iter_subscribers).
+    """
+
+    # Atributos fixos: acesso por posição, sem __dict__ por instância
+    __slots__ = (
+        'available_categories', '_categories_sorted', '_cat_alias',
+        '_msg_subscribed', '_msg_already', '_msg_unsubscribed', '_msg_not_subscribed',
+        'subscriptions', 'client_subscriptions',
+        '_next_id', '_free_ids', '_sock_to_id', '_id_to_sock',
+        'cat_locks', 'client_lock',
+    )
 
     def __init__(self, available_categories: List[str]):
-        self.available_categories = set(cat.lower() for cat in available_categories)
-        # Mapa: categoria -> set de conexões de clientes
-        self.subscriptions: Dict[str, Set[socket.socket]] = {
-            cat: set() for cat in self.available_categories
+        # As categorias são fixas: conjunto para consulta e tupla já ordenada
+        self.available_categories = frozenset([sys.intern(cat.lower()) for cat in available_categories])
+        self._categories_sorted = tuple(sorted(self.available_categories))
+        # Nome -> nome canônico (internado). Nomes já em minúsculas, o caso
+        # comum no protocolo, resolvem com uma consulta, sem chamar lower()
+        self._cat_alias: Dict[str, str] = {cat: cat for cat in self.available_categories}
+        # Respostas de cada categoria montadas uma vez
+        self._msg_subscribed = {cat: f"Inscrito em '{cat}' com sucesso" for cat in self.available_categories}
+        self._msg_already = {cat: f"Já inscrito em '{cat}'" for cat in self.available_categories}
+        self._msg_unsubscribed = {cat: f"Removido de '{cat}' com sucesso" for cat in self.available_categories}
+        self._msg_not_subscribed = {cat: f"Não está inscrito em '{cat}'" for cat in self.available_categories}
+        # Mapa: categoria -> mapa de bits dos IDs inscritos. Um int é
+        # imutável e só é substituído (sob o lock): quem o leu tem um
+        # retrato estável para percorrer sem lock e sem copiar
+        self.subscriptions: Dict[str, int] = {
+            cat: 0 for cat in self.available_categories
         }
-        # Mapa: socket -> set de categorias inscritas
-        self.client_subscriptions: Dict[socket.socket, Set[str]] = {}
-        self.lock = Lock()
+        # Mapa: ID do cliente -> frozenset de categorias inscritas, também
+        # substituído a cada mudança em vez de alterado
+        self.client_subscriptions: Dict[int, FrozenSet[str]] = {}
+        # Registro dos clientes: socket <-> ID
+        self._next_id = 0
+        self._free_ids: List[int] = []  # Heap de IDs liberados
+        self._sock_to_id: Dict[socket.socket, int] = {}
+        self._id_to_sock: Dict[int, socket.socket] = {}
+        # Um lock por categoria (as categorias são fixas), para que inscrições
+        # em categorias diferentes não se bloqueiem, e um lock curto para
+        # client_subscriptions e o registro. Ordem: locks de categoria (em
+        # ordem alfabética) antes de client_lock, nunca o contrário. São Lock
+        # comuns, não reentrantes: nenhum método os toma duas vezes, e os
+        # auxiliares que precisam de um lock exigem que quem chama já o tenha
+        self.cat_locks: Dict[str, Lock] = {cat: Lock() for cat in self.available_categories}
+        self.client_lock = Lock()
+
+    def register(self, client_socket: socket.socket) -> int:
+        """
+        Registra um cliente (ao conectar).
+
+        Args:
+            client_socket: Socket do cliente
+
+        Returns:
+            ID inteiro do cliente (o mesmo, se já estava registrado)
+        """
+        with self.client_lock:
+            client_id = self._sock_to_id.get(client_socket)
+            if client_id is None:
+                if self._free_ids:
+                    client_id = heapq.heappop(self._free_ids)
+                else:
+                    client_id = self._next_id
+                    self._next_id += 1
+                self._sock_to_id[client_socket] = client_id
+                self._id_to_sock[client_id] = client_socket
+            return client_id
+
+    def unregister(self, client_id: int):
+        """
+        Remove o registro e todas as assinaturas de um cliente.
+
+        Args:
+            client_id: ID do cliente
+        """
+        # Remove do registro e só depois, sem client_lock, de cada categoria
+        with self.client_lock:
+            client_socket = self._id_to_sock.pop(client_id, None)
+            if client_socket is None:
+                return
+            del self._sock_to_id[client_socket]
+            categories = self.client_subscriptions.pop(client_id, None)
+
+        self._release(client_id, categories)
+
+    def _release(self, client_id: int, categories: Optional[FrozenSet[str]]):
+        """Tira um cliente já fora do registro das categorias e libera o ID"""
+        if categories:
+            self._remove_from_categories(client_id, categories)
+
+        # O ID só volta a ser usado depois de sair de todas as categorias
+        with self.client_lock:
+            heapq.heappush(self._free_ids, client_id)
+
+    def get_socket(self, client_id: int) -> Optional[socket.socket]:
+        """Retorna o socket de um cliente registrado, ou None"""
+        return self._id_to_sock.get(client_id)
+
+    def _client_id(self, client_socket: socket.socket) -> int:
+        """ID de um cliente, registrando-o se for a primeira vez"""
+        client_id = self._sock_to_id.get(client_socket)
+        if client_id is None:
+            client_id = self.register(client_socket)
+        return client_id
+
+    def _add_subscriber(self, category: str, client_id: int):
+        """
+        Liga o bit do cliente no mapa da categoria (chamar com o lock dela).
+
+        Só é chamado depois de client_subscriptions confirmar que o cliente
+        ainda não estava na categoria.
+        """
+        assert self.cat_locks[category].locked(), "chamar com o lock da categoria"
+        self.subscriptions[category] |= 1 << client_id
+
+    def _remove_subscriber(self, category: str, client_id: int):
+        """Desliga o bit do cliente no mapa da categoria (chamar com o lock dela)"""
+        assert self.cat_locks[category].locked(), "chamar com o lock da categoria"
+        self.subscriptions[category] &= ~(1 << client_id)
+
+    def _canonical(self, category: str) -> Optional[str]:
+        """Nome canônico de uma categoria, ou None se ela não existe"""
+        alias = self._cat_alias
+        return alias.get(category) or alias.get(category.lower())
 
     def subscribe(self, client_socket: socket.socket, category: str) -> tuple[bool, str]:
         """
@@ -32,44 +164,60 @@ class SubscriptionManager:
         Returns:
             Tupla (sucesso, mensagem)
         """
-        category = category.lower()
+        canonical = self._canonical(category)
+        if canonical is None:
+            return False, f"Categoria '{category.lower()}' não existe"
+        category = canonical
 
-        if category not in self.available_categories:
-            return False, f"Categoria '{category}' não existe"
+        client_id = self._client_id(client_socket)
 
         # Se categoria é "todas", inscreve em todas as categorias
         if category == "todas":
-            with self.lock:
-                if client_socket not in self.client_subscriptions:
-                    self.client_subscriptions[client_socket] = set()
-
-                # Inscreve em todas as categorias (exceto "todas" para evitar duplicação)
-                count = 0
-                for cat in self.available_categories:
-                    if cat != "todas" and cat not in self.client_subscriptions[client_socket]:
-                        self.subscriptions[cat].add(client_socket)
-                        self.client_subscriptions[client_socket].add(cat)
-                        count += 1
+            # Inscreve em todas as categorias (exceto "todas" para evitar duplicação)
+            count = 0
+            for cat in self._categories_sorted:
+                if cat != "todas" and self._subscribe_one(client_id, cat):
+                    count += 1
 
             if count > 0:
                 return True, f"Inscrito em todas as categorias ({count} categorias)"
             else:
                 return False, "Já inscrito em todas as categorias"
 
-        with self.lock:
-            # Adiciona cliente ao mapa de assinaturas da categoria
-            self.subscriptions[category].add(client_socket)
+        # Verificação sem lock para o caso comum de inscrição repetida; a
+        # verificação definitiva é refeita sob o lock em _subscribe_one
+        existing = self.client_subscriptions.get(client_id)
+        if existing is not None and category in existing:
+            return False, self._msg_already[category]
+
+        if not self._subscribe_one(client_id, category):
+            return False, self._msg_already[category]
 
-            # Adiciona categoria ao mapa de assinaturas do cliente
-            if client_socket not in self.client_subscriptions:
-                self.client_subscriptions[client_socket] = set()
+        return True, self._msg_subscribed[category]
 
-            if category in self.client_subscriptions[client_socket]:
-                return False, f"Já inscrito em '{category}'"
+    def _subscribe_one(self, client_id: int, category: str) -> bool:
+        """
+        Inscreve um cliente em uma única categoria.
 
-            self.client_subscriptions[client_socket].add(category)
+        Returns:
+            False se o cliente já estava inscrito
+        """
+        with self.cat_locks[category]:
+            with self.client_lock:
+                # Cliente removido no meio do caminho: seu ID pode ser reusado
+                if client_id not in self._id_to_sock:
+                    return False
+
+                # Adiciona categoria ao mapa de assinaturas do cliente
+                client_subscriptions = self.client_subscriptions
+                categories = client_subscriptions.get(client_id, _EMPTY)
+                if category in categories:
+                    return False
+                client_subscriptions[client_id] = categories | {category}
 
-        return True, f"Inscrito em '{category}' com sucesso"
+            # Adiciona cliente ao mapa de assinaturas da categoria
+            self._add_subscriber(category, client_id)
+        return True
 
     def unsubscribe(self, client_socket: socket.socket, category: str) -> tuple[bool, str]:
         """
@@ -82,85 +230,265 @@ class SubscriptionManager:
         Returns:
             Tupla (sucesso, mensagem)
         """
-        category = category.lower()
+        category = self._canonical(category) or category.lower()
+        client_id = self._sock_to_id.get(client_socket)
 
         # Se categoria é "todas", remove de todas as categorias
         if category == "todas":
-            with self.lock:
-                if client_socket not in self.client_subscriptions:
-                    return False, "Cliente não tem assinaturas"
-
-                # Remove de todas as categorias
-                count = 0
-                for cat in list(self.client_subscriptions[client_socket]):
-                    self.subscriptions[cat].discard(client_socket)
-                    count += 1
+            with self.client_lock:
+                categories = self.client_subscriptions.get(client_id)
+                if categories is not None:
+                    self.client_subscriptions[client_id] = _EMPTY
+
+            if categories is None:
+                return False, _NO_SUBSCRIPTIONS
 
-                self.client_subscriptions[client_socket].clear()
+            # Remove de todas as categorias
+            self._remove_from_categories(client_id, categories)
+            count = len(categories)
 
             if count > 0:
                 return True, f"Removido de todas as categorias ({count} categorias)"
             else:
                 return False, "Não está inscrito em nenhuma categoria"
 
-        with self.lock:
-            if client_socket not in self.client_subscriptions:
-                return False, "Cliente não tem assinaturas"
+        # Verificação sem lock dos casos negativos (refeita sob o lock). Só
+        # categorias válidas entram em client_subscriptions, então também
+        # descarta categorias inexistentes antes de procurar o lock delas
+        existing = self.client_subscriptions.get(client_id)
+        if existing is None:
+            return False, _NO_SUBSCRIPTIONS
+        if category not in existing:
+            return False, self._not_subscribed(category)
+
+        # Sob os locks só se altera o estado; as respostas saem depois
+        with self.cat_locks[category]:
+            with self.client_lock:
+                categories = self.client_subscriptions.get(client_id)
+                removed = categories is not None and category in categories
+                if removed:
+                    # Remove categoria do cliente
+                    self.client_subscriptions[client_id] = categories - {category}
+
+            if removed:
+                # Remove cliente da categoria
+                self._remove_subscriber(category, client_id)
+
+        if categories is None:
+            return False, _NO_SUBSCRIPTIONS
+        if not removed:
+            return False, self._not_subscribed(category)
+        return True, self._msg_unsubscribed[category]
+
+    def subscribe_many(self, client_socket: socket.socket, categories: List[str]) -> List[Tuple[bool, str]]:
+        """
+        Inscreve um cliente em várias categorias de uma vez.
 
-            if category not in self.client_subscriptions[client_socket]:
-                return False, f"Não está inscrito em '{category}'"
+        Trava as categorias pedidas (em ordem alfabética) e client_lock uma
+        única vez para o lote todo, em vez de uma vez por categoria.
 
-            # Remove cliente da categoria
-            self.subscriptions[category].discard(client_socket)
+        Args:
+            client_socket: Socket do cliente
+            categories: Categorias para inscrição
+
+        Returns:
+            Lista de (sucesso, mensagem), na ordem das categorias pedidas
+        """
+        if len(categories) == 1:
+            return [self.subscribe(client_socket, categories[0])]
+
+        resolved = [self._canonical(category) for category in categories]
+        if "todas" in resolved:
+            # "todas" depende da ordem em relação às demais: uma por vez
+            return [self.subscribe(client_socket, category) for category in categories]
+
+        results: List[Optional[Tuple[bool, str]]] = [None] * len(categories)
+        wanted: Dict[str, List[int]] = {}
+        for i, canonical in enumerate(resolved):
+            if canonical is None:
+                results[i] = (False, f"Categoria '{categories[i].lower()}' não existe")
+            else:
+                wanted.setdefault(canonical, []).append(i)
+
+        added = _EMPTY
+        if wanted:
+            client_id = self._client_id(client_socket)
+            with ExitStack() as stack:
+                for category in sorted(wanted):
+                    stack.enter_context(self.cat_locks[category])
+
+                with self.client_lock:
+                    # Cliente removido no meio do caminho: seu ID pode ser reusado
+                    if client_id in self._id_to_sock:
+                        current = self.client_subscriptions.get(client_id, _EMPTY)
+                        added = frozenset(wanted) - current
+                        if added:
+                            self.client_subscriptions[client_id] = current | added
+
+                for category in added:
+                    self._add_subscriber(category, client_id)
+
+        for category, indexes in wanted.items():
+            for i in indexes:
+                results[i] = (False, self._msg_already[category])
+            if category in added:
+                results[indexes[0]] = (True, self._msg_subscribed[category])
+        return results
+
+    def unsubscribe_many(self, client_socket: socket.socket, categories: List[str]) -> List[Tuple[bool, str]]:
+        """
+        Remove as inscrições de um cliente em várias categorias de uma vez.
 
-            # Remove categoria do cliente
-            self.client_subscriptions[client_socket].discard(category)
+        Args:
+            client_socket: Socket do cliente
+            categories: Categorias para remover
 
-        return True, f"Removido de '{category}' com sucesso"
+        Returns:
+            Lista de (sucesso, mensagem), na ordem das categorias pedidas
+        """
+        if len(categories) == 1:
+            return [self.unsubscribe(client_socket, categories[0])]
+
+        resolved = [self._canonical(category) or category.lower() for category in categories]
+        if "todas" in resolved:
+            return [self.unsubscribe(client_socket, category) for category in categories]
+
+        client_id = self._sock_to_id.get(client_socket)
+        # Só categorias existentes têm lock; as demais nunca estão inscritas
+        valid = frozenset([category for category in resolved if category in self.cat_locks])
+
+        removed = _EMPTY
+        with ExitStack() as stack:
+            for category in sorted(valid):
+                stack.enter_context(self.cat_locks[category])
+
+            with self.client_lock:
+                current = self.client_subscriptions.get(client_id)
+                if current is not None:
+                    removed = valid & current
+                    if removed:
+                        self.client_subscriptions[client_id] = current - removed
+
+            for category in removed:
+                self._remove_subscriber(category, client_id)
+
+        if current is None:
+            return [(False, _NO_SUBSCRIPTIONS)] * len(categories)
+
+        results = []
+        pending = set(removed)
+        for category in resolved:
+            if category in pending:
+                pending.discard(category)
+                results.append((True, self._msg_unsubscribed[category]))
+            else:
+                results.append((False, self._not_subscribed(category)))
+        return results
+
+    def _not_subscribed(self, category: str) -> str:
+        """Resposta de "não inscrito" (pronta, exceto para categorias inexistentes)"""
+        message = self._msg_not_subscribed.get(category)
+        if message is None:
+            message = f"Não está inscrito em '{category}'"
+        return message
 
-    def get_subscribers(self, category: str) -> Set[socket.socket]:
+    def get_subscribers(self, category: str) -> int:
         """
-        Retorna todos os clientes inscritos em uma categoria.
+        Retorna os clientes inscritos em uma categoria.
+
+        O mapa de bits devolvido é um retrato imutável: não precisa de lock
+        nem de cópia, e inscrições posteriores não o afetam. Cada bit ligado
+        é o ID de um inscrito; o socket vem de get_socket().
 
         Args:
             category: Categoria a consultar
 
         Returns:
-            Set de sockets de clientes inscritos
+            Mapa de bits (int) dos IDs inscritos
         """
-        category = category.lower()
-        with self.lock:
-            return self.subscriptions.get(category, set()).copy()
+        return self.subscriptions.get(self._canonical(category), 0)
 
-    def get_client_subscriptions(self, client_socket: socket.socket) -> Set[str]:
+    def iter_subscribers(self, category: str) -> Iterator[socket.socket]:
+        """
+        Percorre os sockets dos clientes inscritos em uma categoria.
+
+        Lê o mapa de bits uma vez (retrato imutável, sem lock) e devolve os
+        sockets um a um, do menor ID para o maior, sem montar coleção.
+
+        IDs são reaproveitados: se um inscrito sai e outro cliente recebe o
+        mesmo ID enquanto o retrato é percorrido, o bit antigo aponta para o
+        cliente novo. Por isso cada ID só é entregue se o dono atual dele
+        estiver de fato inscrito na categoria.
+
+        Args:
+            category: Categoria a consultar
+
+        Yields:
+            Socket de cada inscrito ainda registrado
+        """
+        category = self._canonical(category)
+        bits = self.subscriptions.get(category, 0)
+        id_to_sock = self._id_to_sock
+        client_subscriptions = self.client_subscriptions
+        while bits:
+            # Bit ligado mais baixo = menor ID ainda não visitado
+            lowest = bits & -bits
+            bits ^= lowest
+            client_id = lowest.bit_length() - 1
+            client_socket = id_to_sock.get(client_id)
+            if client_socket is not None and category in client_subscriptions.get(client_id, _EMPTY):
+                yield client_socket
+
+    def get_client_subscriptions(self, client_socket: socket.socket) -> FrozenSet[str]:
         """
         Retorna todas as categorias em que um cliente está inscrito.
 
+        O frozenset devolvido é um retrato imutável, lido sem lock.
+
         Args:
             client_socket: Socket do cliente
 
         Returns:
-            Set de categorias
+            Frozenset de categorias
         """
-        with self.lock:
-            return self.client_subscriptions.get(client_socket, set()).copy()
+        client_id = self._sock_to_id.get(client_socket)
+        return self.client_subscriptions.get(client_id, _EMPTY)
 
-    def remove_client(self, client_socket: socket.socket):
+    def remove_client(self, client_socket: socket.socket) -> FrozenSet[str]:
         """
         Remove todas as assinaturas de um cliente (ao desconectar).
 
+        Sob client_lock só retira o cliente do registro e guarda o retrato
+        das suas categorias; cada categoria é atualizada depois, com o lock
+        dela, sem segurar client_lock.
+
         Args:
             client_socket: Socket do cliente
-        """
-        with self.lock:
-            if client_socket in self.client_subscriptions:
-                # Remove de todas as categorias
-                for category in self.client_subscriptions[client_socket]:
-                    self.subscriptions[category].discard(client_socket)
 
-                # Remove do mapa de clientes
-                del self.client_subscriptions[client_socket]
+        Returns:
+            Categorias em que o cliente estava inscrito
+        """
+        # pop: uma consulta só para testar e remover
+        with self.client_lock:
+            client_id = self._sock_to_id.pop(client_socket, None)
+            if client_id is None:
+                return _EMPTY
+            del self._id_to_sock[client_id]
+            categories = self.client_subscriptions.pop(client_id, None)
+
+        self._release(client_id, categories)
+        return categories or _EMPTY
+
+    def _remove_from_categories(self, client_id: int, categories: FrozenSet[str]):
+        """Retira o cliente das categorias dadas, travando uma de cada vez"""
+        # Máscara calculada uma vez: cada categoria custa uma operação de int
+        mask = ~(1 << client_id)
+        subscriptions = self.subscriptions
+        cat_locks = self.cat_locks
+        for category in sorted(categories):
+            with cat_locks[category]:
+                subscriptions[category] &= mask
 
     def get_available_categories(self) -> List[str]:
         """Retorna lista de categorias disponíveis"""
-        return sorted(list(self.available_categories))
+        return list(self._categories_sorted)